@@ -1,13 +1,41 @@
 """Filtering logic for classes."""
 
-from typing import List, Dict, Optional
-from datetime import datetime
+from functools import lru_cache
+from typing import Callable, List, Dict, Optional
 from src.database.models import UserFilter
+from src.utils.helpers import format_datetime_display, parse_datetime
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _compile_filter(zone_id: Optional[str], trainer_id: Optional[str], timetable_id: Optional[str]) -> Callable[[Dict], bool]:
+    """
+    Build a single predicate for the given filter criteria.
+    
+    Only the criteria that are set are checked, and filter values are bound
+    as closure locals, so the per-class test does no UserFilter attribute
+    lookups. The predicate also drops classes without available spots.
+    """
+    checks = []
+    if zone_id:
+        checks.append(("ZoneId", "zone_id", zone_id))
+    if trainer_id:
+        checks.append(("TrainerId", "trainer_id", trainer_id))
+    if timetable_id:
+        checks.append(("TimetableId", "timetable_id", timetable_id))
+    checks = tuple(checks)
+    
+    def match(c: Dict) -> bool:
+        for key, alt_key, value in checks:
+            if c.get(key) != value and c.get(alt_key) != value:
+                return False
+        return c.get("AvailableSpots", c.get("available_spots", 0)) > 0
+    
+    return match
+
+
 def filter_classes(classes: List[Dict], user_filter: Optional[UserFilter], user_id: int = None) -> List[Dict]:
     """
     Filter available classes based on user preferences.
@@ -20,29 +48,22 @@ def filter_classes(classes: List[Dict], user_filter: Optional[UserFilter], user_
     Returns:
         Filtered list of classes
     """
-    if not user_filter:
+    if user_filter is None:
         logger.info(f"No filters set, returning all classes", extra={'user_id': user_id})
         return classes
     
-    filtered = classes
-    
-    # Filter by zone/gym
-    if user_filter.zone_id:
-        filtered = [c for c in filtered if c.get("ZoneId") == user_filter.zone_id or c.get("zone_id") == user_filter.zone_id]
-        logger.debug(f"Filtered by zone: {user_filter.zone_id}, remaining: {len(filtered)}", extra={'user_id': user_id})
-    
-    # Filter by trainer
-    if user_filter.trainer_id:
-        filtered = [c for c in filtered if c.get("TrainerId") == user_filter.trainer_id or c.get("trainer_id") == user_filter.trainer_id]
-        logger.debug(f"Filtered by trainer: {user_filter.trainer_id}, remaining: {len(filtered)}", extra={'user_id': user_id})
-    
-    # Filter by timetable/activity type
-    if user_filter.timetable_id:
-        filtered = [c for c in filtered if c.get("TimetableId") == user_filter.timetable_id or c.get("timetable_id") == user_filter.timetable_id]
-        logger.debug(f"Filtered by timetable: {user_filter.timetable_id}, remaining: {len(filtered)}", extra={'user_id': user_id})
+    if user_filter.is_empty():
+        # No criteria to apply, only drop fully booked classes
+        logger.debug(f"Filter has no criteria", extra={'user_id': user_id})
+        return [c for c in classes if c.get("AvailableSpots", c.get("available_spots", 0)) > 0]
     
-    # Filter only classes with available spots
-    filtered = [c for c in filtered if c.get("AvailableSpots", c.get("available_spots", 0)) > 0]
+    match = _compile_filter(user_filter.zone_id, user_filter.trainer_id, user_filter.timetable_id)
+    filtered = [c for c in classes if match(c)]
+    logger.debug(
+        f"Filtered by zone={user_filter.zone_id}, trainer={user_filter.trainer_id}, "
+        f"timetable={user_filter.timetable_id}, remaining: {len(filtered)}",
+        extra={'user_id': user_id}
+    )
     
     logger.info(f"Filtering complete: {len(filtered)} classes match criteria", extra={'user_id': user_id})
     return filtered
@@ -69,18 +90,14 @@ def format_class_for_telegram(class_data: Dict, user_id: int = None) -> str:
         
         # Parse datetime if it's a string
         if isinstance(start_time, str):
-            try:
-                start_time = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                start_time = start_time.strftime("%d.%m.%Y %H:%M")
-            except:
-                pass
+            start_dt = parse_datetime(start_time)
+            if start_dt:
+                start_time = format_datetime_display(start_dt)
         
         if isinstance(end_time, str):
-            try:
-                end_time = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-                end_time = end_time.strftime("%H:%M")
-            except:
-                pass
+            end_dt = parse_datetime(end_time)
+            if end_dt:
+                end_time = end_dt.strftime("%H:%M")
         
         message = (
             f"<b>{title}</b>\n"
@@ -1,10 +1,14 @@
 """zdrofit API client - Unofficial Python implementation."""
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Optional, TYPE_CHECKING
 from datetime import datetime, timedelta
 import json
+import logging
 import time
+from src.utils.helpers import parse_datetime, parse_time_of_day, parse_weekday_mask
 from src.utils.logger import get_logger
 from config.config import ZDROFIT_API_BASE_URL, SEARCH_WINDOW_HOURS
 
@@ -18,6 +22,9 @@ DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.
 AUTH_COOKIE_NAME = "ClientPortal.Auth.bak"
 MAX_RETRIES = 3
 RETRY_DELAY_SECONDS = 2  # Start with 2 seconds, will double each retry
+# Transport-level retries: failed connects only. Read errors are not retried
+# (the request may have reached the server) and 5xx are handled per call
+CONNECTION_RETRIES = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2)
 
 
 class ZdrofitAPIClient:
@@ -28,6 +35,11 @@ class ZdrofitAPIClient:
         self.password = password
         self.base_url = ZDROFIT_API_BASE_URL
         self.session = requests.Session()
+        # Keep-alive pool with transport-level retries
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            max_retries=CONNECTION_RETRIES
+        ))
         self.session.headers.update({
             "User-Agent": DEFAULT_USER_AGENT,
             "Content-Type": "application/json",
@@ -60,13 +72,15 @@ class ZdrofitAPIClient:
         for attempt in range(MAX_RETRIES):
             try:
                 logger.debug(f"POST {url} (attempt {attempt + 1}/{MAX_RETRIES})", extra={'user_id': user_id or 'unknown'})
-                logger.debug(f"Request body: {json.dumps({k: v if k != 'Password' else '***' for k, v in payload.items()})}", 
-                            extra={'user_id': user_id or 'unknown'})
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Request body: {json.dumps({k: v if k != 'Password' else '***' for k, v in payload.items()})}", 
+                                extra={'user_id': user_id or 'unknown'})
                 
                 response = self.session.post(url, json=payload, timeout=10)
                 
                 logger.debug(f"Response status: {response.status_code}", extra={'user_id': user_id or 'unknown'})
-                logger.debug(f"Response body: {response.text}", extra={'user_id': user_id or 'unknown'})
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Response body: {response.text}", extra={'user_id': user_id or 'unknown'})
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -144,12 +158,13 @@ class ZdrofitAPIClient:
                     "zoneId": None
                 }
                 logger.debug(f"POST {url} for date {current_date.date()}", extra={'user_id': user_id or 'unknown'})
-                logger.debug(f"Request body: {json.dumps(payload)}", extra={'user_id': user_id or 'unknown'})
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Request body: {json.dumps(payload)}", extra={'user_id': user_id or 'unknown'})
                 
                 response = self.session.post(url, json=payload)
                 
                 logger.debug(f"Response status: {response.status_code}", extra={'user_id': user_id or 'unknown'})
-                if response.status_code == 200:
+                if response.status_code == 200 and logger.isEnabledFor(logging.DEBUG):
                     logger.debug(f"Response body: {response.text}", extra={'user_id': user_id or 'unknown'})
                 
                 if response.status_code == 200:
@@ -207,7 +222,7 @@ class ZdrofitAPIClient:
             response = self.session.get(url)
             
             logger.debug(f"Response status: {response.status_code}", extra={'user_id': user_id or 'unknown'})
-            if response.status_code == 200:
+            if response.status_code == 200 and logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Response body: {response.text}", extra={'user_id': user_id or 'unknown'})
             
             if response.status_code == 200:
@@ -265,12 +280,14 @@ class ZdrofitAPIClient:
             url = f"{self.base_url}/ClientPortal2/Classes/ClassCalendar/BookClass"
             payload = {"classId": class_id}
             logger.debug(f"POST {url}", extra={'user_id': user_id or 'unknown'})
-            logger.debug(f"Request body: {json.dumps(payload)}", extra={'user_id': user_id or 'unknown'})
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Request body: {json.dumps(payload)}", extra={'user_id': user_id or 'unknown'})
             
             response = self.session.post(url, json=payload)
             
             logger.debug(f"Response status: {response.status_code}", extra={'user_id': user_id or 'unknown'})
-            logger.debug(f"{response.text[:500]}", extra={'user_id': user_id or 'unknown'})
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"{response.text[:500]}", extra={'user_id': user_id or 'unknown'})
             
             if response.status_code == 200:
                 logger.info(f"Successfully booked class {class_id}", extra={'user_id': user_id or 'unknown'})
@@ -297,12 +314,14 @@ class ZdrofitAPIClient:
             url = f"{self.base_url}/ClientPortal2/Classes/ClassCalendar/CancelBooking"
             payload = {"classId": class_id}
             logger.debug(f"POST {url}", extra={'user_id': user_id or 'unknown'})
-            logger.debug(f"Request body: {json.dumps(payload)}", extra={'user_id': user_id or 'unknown'})
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Request body: {json.dumps(payload)}", extra={'user_id': user_id or 'unknown'})
             
             response = self.session.post(url, json=payload)
             
             logger.debug(f"Response status: {response.status_code}", extra={'user_id': user_id or 'unknown'})
-            logger.debug(f"Response body: {response.text}", extra={'user_id': user_id or 'unknown'})
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Response body: {response.text}", extra={'user_id': user_id or 'unknown'})
             
             if response.status_code in [200, 204]:
                 logger.info(f"Successfully cancelled booking for class {class_id}", extra={'user_id': user_id or 'unknown'})
@@ -376,7 +395,8 @@ class ZdrofitAPIClient:
                                     "Name": trainer_name
                                 }
             
-            trainers_list = sorted(list(trainers_dict.values()), key=lambda x: x["Name"])
+            # Keys are the trainer names, so sort them directly instead of by a key function
+            trainers_list = [trainers_dict[name] for name in sorted(trainers_dict)]
             logger.info(f"Retrieved {len(trainers_list)} unique trainers for timetable {timetable_id}: {[t['Name'] for t in trainers_list]}", 
                        extra={'user_id': user_id or 'unknown'})
             return trainers_list
@@ -411,12 +431,13 @@ class ZdrofitAPIClient:
             
             payload = {"clubId": club_id}
             logger.debug(f"POST {url}", extra={'user_id': user_id or 'unknown'})
-            logger.debug(f"Request body: {json.dumps(payload)}", extra={'user_id': user_id or 'unknown'})
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Request body: {json.dumps(payload)}", extra={'user_id': user_id or 'unknown'})
             
             response = self.session.post(url, json=payload)
             
             logger.debug(f"Response status: {response.status_code}", extra={'user_id': user_id or 'unknown'})
-            if response.status_code == 200:
+            if response.status_code == 200 and logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Response body: {response.text}", extra={'user_id': user_id or 'unknown'})
             
             if response.status_code == 200:
@@ -482,18 +503,14 @@ class ZdrofitAPIClient:
                 logger.debug(f"Filtered by trainer {user_filter.trainer_name}: {before_count} -> {len(filtered_classes)}", 
                            extra={'user_id': user_id or 'unknown'})
             
-            # Filter by weekdays (days of week)
-            if user_filter.weekdays:
-                before_count = len(filtered_classes)
-                filtered_classes = self._filter_by_weekdays(filtered_classes, user_filter.weekdays)
-                logger.debug(f"Filtered by weekdays {user_filter.weekdays}: {before_count} -> {len(filtered_classes)}", 
-                           extra={'user_id': user_id or 'unknown'})
-            
-            # Filter by time range
-            if user_filter.time_from or user_filter.time_to:
+            # Filter by weekdays (days of week) and time range
+            if user_filter.weekdays or user_filter.time_from or user_filter.time_to:
                 before_count = len(filtered_classes)
-                filtered_classes = self._filter_by_time(filtered_classes, user_filter.time_from, user_filter.time_to)
-                logger.debug(f"Filtered by time {user_filter.time_from}-{user_filter.time_to}: {before_count} -> {len(filtered_classes)}", 
+                filtered_classes = self._filter_by_slot(
+                    filtered_classes, user_filter.weekdays, user_filter.time_from, user_filter.time_to
+                )
+                logger.debug(f"Filtered by weekdays {user_filter.weekdays}, time {user_filter.time_from}-{user_filter.time_to}: "
+                           f"{before_count} -> {len(filtered_classes)}", 
                            extra={'user_id': user_id or 'unknown'})
             
             logger.info(f"Returned {len(filtered_classes)} classes after applying filters", 
@@ -504,79 +521,60 @@ class ZdrofitAPIClient:
             logger.error(f"Error filtering classes: {str(e)}", extra={'user_id': user_id or 'unknown'})
             return self.get_available_classes(user_id=user_id)
     
-    def _filter_by_weekdays(self, classes: List[Dict], weekdays: str) -> List[Dict]:
+    @staticmethod
+    def _filter_by_slot(classes: List[Dict], weekdays: str = None,
+                       time_from: str = None, time_to: str = None) -> List[Dict]:
         """
-        Filter classes by days of week.
+        Filter classes by days of week and time range in one pass.
         
         Args:
             classes: List of classes to filter
             weekdays: Comma-separated string of weekday numbers (1=Monday, 2=Tuesday, ..., 7=Sunday)
                      Example: "1,2,3,4,5" for Monday-Friday
+            time_from: Earliest start time (HH:MM), inclusive
+            time_to: Latest start time (HH:MM), inclusive
         
         Returns:
-            Filtered list of classes matching the specified weekdays
+            Filtered list of classes, in their original order. Classes without
+            a parsable start time are dropped by a weekday filter but kept by
+            a time filter alone. A time bound that is set but not HH:MM matches
+            no start time.
         """
-        if not weekdays:
-            return classes
+        # Weekdays as a bitmask and times as minutes since midnight, parsed once per selector
+        weekday_mask = parse_weekday_mask(weekdays)
+        minute_from = parse_time_of_day(time_from)
+        minute_to = parse_time_of_day(time_to)
         
-        try:
-            # Parse weekdays string to set of integers
-            allowed_weekdays = set(int(day.strip()) for day in weekdays.split(',') if day.strip())
-            
-            if not allowed_weekdays:
-                return classes
-            
-            filtered = []
-            for cls in classes:
-                start_time_str = cls.get('start_time', '')
-                if start_time_str:
-                    try:
-                        # Parse start time and get weekday
-                        start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                        # Python's weekday(): 0=Monday, 1=Tuesday, ..., 6=Sunday
-                        # Our format: 1=Monday, 2=Tuesday, ..., 7=Sunday
-                        class_weekday = start_time.weekday() + 1
-                        
-                        # Check if class is on allowed weekday
-                        if class_weekday in allowed_weekdays:
-                            filtered.append(cls)
-                    except Exception as e:
-                        logger.debug(f"Error parsing date for weekday filter: {e}")
-                        # If can't parse, exclude it to be safe
-                        continue
-                else:
-                    # No start time - exclude it
-                    continue
-            
-            return filtered
-        except Exception as e:
-            logger.error(f"Error in weekday filtering: {e}")
-            return classes  # Return all classes if filtering fails
-    
-    def _filter_by_time(self, classes: List[Dict], time_from: str = None, time_to: str = None) -> List[Dict]:
-        """Filter classes by time range (HH:MM format)."""
-        if not time_from and not time_to:
+        # Malformed bound: exclude every dated class instead of dropping the bound
+        if time_from and minute_from is None:
+            minute_from = 24 * 60
+        if time_to and minute_to is None:
+            minute_to = -1
+        
+        if weekday_mask is None and minute_from is None and minute_to is None:
             return classes
         
         filtered = []
         for cls in classes:
-            start_time_str = cls.get('start_time', '')
-            if start_time_str:
-                try:
-                    start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                    class_time = start_time.strftime("%H:%M")
-                    
-                    # Check if within time range
-                    if time_from and class_time < time_from:
-                        continue
-                    if time_to and class_time > time_to:
-                        continue
-                    
+            start_time_str = cls.get('start_time')
+            # Memoized by the raw string
+            start_time = parse_datetime(start_time_str) if isinstance(start_time_str, str) else None
+            if start_time is None:
+                if weekday_mask is None:
                     filtered.append(cls)
-                except:
-                    filtered.append(cls)  # If can't parse, include it
-            else:
-                filtered.append(cls)
+                continue
+            
+            # Python's weekday(): 0=Monday, 1=Tuesday, ..., 6=Sunday, i.e. the mask bit
+            if weekday_mask is not None and not (weekday_mask >> start_time.weekday()) & 1:
+                continue
+            
+            minute = start_time.hour * 60 + start_time.minute
+            if minute_from is not None and minute < minute_from:
+                continue
+            if minute_to is not None and minute > minute_to:
+                continue
+            
+            filtered.append(cls)
         
         return filtered
 
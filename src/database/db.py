@@ -1,9 +1,12 @@
 """Database connection and operations module."""
 
+import itertools
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from config.config import DB_PATH
 from src.utils.logger import get_logger
 from src.utils.crypto import PasswordEncryptor
@@ -11,27 +14,210 @@ from src.database.models import User, UserFilter, Booking, FilterCatalog
 
 logger = get_logger(__name__)
 
+# Per-connection tuning; journal_mode=WAL is persistent and set once in _init_db.
+# Connections live for a single operation, so page cache / mmap sizes are left
+# at SQLite defaults: a bigger cache would be thrown away on every close
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",     # Safe with WAL: fsync on checkpoint instead of on every commit
+    "PRAGMA temp_store=MEMORY",      # Sorts and temp indexes stay in RAM
+)
+
+# Rows per fetchmany() call when streaming query results
+_FETCH_BATCH_SIZE = 256
+
+# Sample at most this many rows per index when running ANALYZE
+_SQL_ANALYZE_LIMIT = "PRAGMA analysis_limit=1000"
+
+# Filter catalog statements: fixed SQL text with positional placeholders
+_SQL_SAVE_CATALOG = '''
+    INSERT OR REPLACE INTO filter_catalog 
+    (zone_id, zone_name, filter_type, data, cached_at, expires_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+_SQL_GET_CATALOG = '''
+    SELECT data, expires_at FROM filter_catalog 
+    WHERE zone_id = ? AND filter_type = ?
+    AND (expires_at IS NULL OR expires_at > ?)
+    LIMIT 1
+'''
+_SQL_INVALIDATE_CATALOG_TYPE = 'DELETE FROM filter_catalog WHERE zone_id = ? AND filter_type = ?'
+_SQL_INVALIDATE_CATALOG_ZONE = 'DELETE FROM filter_catalog WHERE zone_id = ?'
+_SQL_INVALIDATE_CATALOG_ALL = 'DELETE FROM filter_catalog'
+_SQL_PURGE_CATALOG = 'DELETE FROM filter_catalog WHERE expires_at < ?'
+
+# User filters
+MAX_FILTERS_PER_USER = 3
+_SQL_COUNT_FILTERS = 'SELECT COUNT(*) as count FROM user_filters WHERE user_id = ?'
+_SQL_GET_FILTER_BY_ID = 'SELECT * FROM user_filters WHERE id = ? AND user_id = ? LIMIT 1'
+_SQL_INSERT_FILTER = '''
+    INSERT INTO user_filters 
+    (user_id, club_id, club_name, zone_id, zone_name, timetable_id, timetable_name, 
+     category_id, category_name, trainer_id, trainer_name, time_from, time_to, weekdays, auto_booking)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Active bookings; all are served by idx_bookings_active_user
+_SQL_GET_ACTIVE_BOOKINGS = '''
+    SELECT * FROM bookings 
+    WHERE user_id = ? AND cancelled_at IS NULL
+    ORDER BY start_time
+'''
+# start_time holds raw API strings ("2026-01-19T06:00:00Z") as well as Python
+# datetimes, so upcoming checks compare instants via julianday(), not text;
+# values without an offset are taken as UTC
+_SQL_GET_UPCOMING_BOOKINGS = '''
+    SELECT * FROM bookings 
+    WHERE user_id = ? AND cancelled_at IS NULL AND julianday(start_time) >= julianday(?)
+    ORDER BY start_time
+'''
+_SQL_GET_ACTIVE_BOOKING_IDS = '''
+    SELECT class_id FROM bookings 
+    WHERE user_id = ? AND cancelled_at IS NULL
+'''
+_SQL_GET_UPCOMING_BOOKING_IDS = '''
+    SELECT class_id FROM bookings 
+    WHERE user_id = ? AND cancelled_at IS NULL AND julianday(start_time) >= julianday(?)
+'''
+
+
+def _utc_now() -> str:
+    """Current UTC time as bound for the julianday() start_time checks."""
+    return datetime.now(timezone.utc).isoformat(sep=' ', timespec='seconds')
+
+
+class _TransactionConnection(sqlite3.Connection):
+    """
+    Connection shared by all operations inside Database.transaction().
+    
+    Methods commit and close their own connection as usual; while the
+    transaction is open those calls (and `with conn:` blocks) are no-ops, and
+    the single COMMIT or ROLLBACK is issued by transaction() itself.
+    """
+    
+    def commit(self):
+        pass
+    
+    def close(self):
+        pass
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
 
 class Database:
     """SQLite database handler."""
     
+    _memory_db_ids = itertools.count(1)
+    
+    # In-process front for filter catalog, shared by all instances:
+    # {(db_path, zone_id, filter_type): (data, expires_at)}
+    # Only writes through this process invalidate it; changes made by other
+    # processes (e.g. manage_db.py) are seen once the entry's expires_at passes
+    _catalog_cache: Dict[Tuple[str, str, str], Tuple[str, Optional[datetime]]] = {}
+    _catalog_cache_size = 128
+    # {(db_path, zone_id): {filter_type, ...}} for per-zone invalidation
+    _catalog_zone_index: Dict[Tuple[str, str], set] = {}
+    _catalog_lock = threading.Lock()
+    
+    # Active booked class IDs per user, shared by all instances:
+    # {(db_path, user_id): frozenset(class_id, ...)}; dropped on every booking write
+    _active_bookings_cache: Dict[Tuple[str, int], frozenset] = {}
+    # Bumped on invalidation so a load racing with a write is not cached
+    _active_bookings_versions: Dict[Tuple[str, int], int] = {}
+    _active_bookings_lock = threading.Lock()
+    
     def __init__(self, db_path: str = DB_PATH):
+        self._uri = False
+        self._keeper = None
+        # Per-thread state of an open transaction()
+        self._local = threading.local()
+        if db_path == ":memory:":
+            # Every operation opens its own connection, so use a named shared-cache
+            # in-memory database and keep one connection open to keep it alive
+            db_path = f"file:zdrofit_mem_{next(self._memory_db_ids)}?mode=memory&cache=shared"
+        if db_path.startswith("file:"):
+            # SQLite URI, e.g. "file:test_db?mode=memory&cache=shared"
+            self._uri = True
+            if "mode=memory" in db_path:
+                self._keeper = sqlite3.connect(db_path, uri=True)
+        else:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self.db_path = db_path
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
     
-    def get_connection(self):
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
+    def close(self):
+        """Release in-memory database (no-op for file databases)."""
+        if self._keeper:
+            self._keeper.close()
+            self._keeper = None
+            # The name may be reused for a new, empty database
+            self._uncache_catalog()
+            with self._active_bookings_lock:
+                for key in [k for k in self._active_bookings_cache if k[0] == self.db_path]:
+                    del self._active_bookings_cache[key]
+    
+    def _connect(self, factory=sqlite3.Connection) -> sqlite3.Connection:
+        """Open new configured connection."""
+        conn = sqlite3.connect(self.db_path, uri=self._uri, factory=factory)
         conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
     
+    def get_connection(self):
+        """Get database connection (the open transaction's one, if any)."""
+        conn = getattr(self._local, 'transaction_conn', None)
+        if conn is not None:
+            return conn
+        return self._connect()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Run several operations in one transaction with a single commit.
+        
+        Inside the block every method of this instance (in the current thread)
+        uses the same connection; the work is committed once on exit or rolled
+        back if the block raises. Nested blocks join the outer transaction.
+        
+        Usage:
+            with db.transaction():
+                for user_filter in filters:
+                    db.add_filter(user_filter)
+        """
+        if getattr(self._local, 'transaction_conn', None) is not None:
+            yield self._local.transaction_conn
+            return
+        
+        conn = self._connect(factory=_TransactionConnection)
+        conn.execute("BEGIN")
+        self._local.transaction_conn = conn
+        self._local.touched_user_ids = set()
+        try:
+            yield conn
+            sqlite3.Connection.commit(conn)
+        except BaseException:
+            sqlite3.Connection.rollback(conn)
+            # Catalog cache is written through before commit
+            self._uncache_catalog()
+            raise
+        finally:
+            self._local.transaction_conn = None
+            touched_user_ids = self._local.touched_user_ids
+            self._local.touched_user_ids = None
+            sqlite3.Connection.close(conn)
+            # Drop entries other threads may have loaded before commit
+            self._uncache_active_bookings(touched_user_ids)
+    
     def _init_db(self):
         """Initialize database tables."""
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
+            # WAL journal: readers don't block the writer (persisted in the file)
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # Users table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS users (
@@ -147,7 +333,18 @@ class Database:
                 # Column already exists, ignore
                 pass
             
+            # Partial index covers only active (not cancelled) bookings;
+            # (user_id, class_id) lookups use the UNIQUE(user_id, class_id) autoindex
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_bookings_active_user
+                ON bookings(user_id, start_time) WHERE cancelled_at IS NULL
+            ''')
+            
             conn.commit()
+            
+            # Refresh sqlite_stat1 so the planner sees real index selectivity
+            conn.execute(_SQL_ANALYZE_LIMIT)
+            conn.execute("ANALYZE")
             conn.close()
             logger.info("Database initialized successfully")
         except Exception as e:
@@ -291,6 +488,7 @@ class Database:
     def add_booking(self, booking: Booking) -> bool:
         """Add or update booking."""
         try:
+            now = datetime.now()
             conn = self.get_connection()
             cursor = conn.cursor()
             cursor.execute('''
@@ -298,83 +496,175 @@ class Database:
                 (user_id, class_id, title, start_time, booked_at, filter_id, is_auto_booked, updated_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (booking.user_id, booking.class_id, booking.title, 
-                  booking.start_time, datetime.now(), booking.filter_id, 
-                  int(booking.is_auto_booked), datetime.now()))
+                  booking.start_time, now, booking.filter_id, 
+                  int(booking.is_auto_booked), now))
             conn.commit()
             conn.close()
+            self._uncache_active_bookings((booking.user_id,))
             logger.info(f"Booking added", extra={'user_id': booking.user_id})
             return True
         except Exception as e:
             logger.error(f"Error adding booking: {e}", extra={'user_id': booking.user_id})
             return False
     
+    def add_bookings(self, bookings: List[Booking]) -> int:
+        """Add or update several bookings in a single transaction."""
+        if not bookings:
+            return 0
+        try:
+            now = datetime.now()
+            conn = self.get_connection()
+            with conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO bookings 
+                    (user_id, class_id, title, start_time, booked_at, filter_id, is_auto_booked, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(b.user_id, b.class_id, b.title, b.start_time, now, b.filter_id,
+                       int(b.is_auto_booked), now) for b in bookings])
+            conn.close()
+            self._uncache_active_bookings({b.user_id for b in bookings})
+            logger.info(f"Added {len(bookings)} bookings")
+            return len(bookings)
+        except Exception as e:
+            logger.error(f"Error adding bookings: {e}")
+            return 0
+    
     def cancel_booking(self, user_id: int, class_id: str) -> bool:
         """Cancel booking."""
         try:
+            now = datetime.now()
             conn = self.get_connection()
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE bookings 
                 SET cancelled_at = ?, updated_at = ?
                 WHERE user_id = ? AND class_id = ? AND cancelled_at IS NULL
-            ''', (datetime.now(), datetime.now(), user_id, class_id))
+            ''', (now, now, user_id, class_id))
             conn.commit()
             conn.close()
+            self._uncache_active_bookings((user_id,))
             logger.info(f"Booking cancelled", extra={'user_id': user_id})
             return True
         except Exception as e:
             logger.error(f"Error cancelling booking: {e}", extra={'user_id': user_id})
             return False
     
-    def get_user_bookings(self, user_id: int) -> List[Booking]:
-        """Get active user bookings."""
+    @staticmethod
+    def _booking_from_row(row: sqlite3.Row) -> Booking:
+        """Build Booking from a bookings table row."""
+        # Safely extract fields, handling None values
+        filter_id = row['filter_id'] if row['filter_id'] is not None else None
+        is_auto_booked = bool(row['is_auto_booked']) if row['is_auto_booked'] is not None else False
+        
+        return Booking(
+            id=row['id'],
+            user_id=row['user_id'],
+            class_id=row['class_id'],
+            title=row['title'],
+            start_time=datetime.fromisoformat(row['start_time']),
+            booked_at=datetime.fromisoformat(row['booked_at']),
+            cancelled_at=datetime.fromisoformat(row['cancelled_at']) if row['cancelled_at'] else None,
+            filter_id=filter_id,
+            is_auto_booked=is_auto_booked,
+            created_at=datetime.fromisoformat(row['created_at']),
+            updated_at=datetime.fromisoformat(row['updated_at'])
+        )
+    
+    def _iter_bookings(self, user_id: int, upcoming_only: bool) -> Iterator[Booking]:
+        """Yield active user bookings, fetching rows in batches."""
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM bookings 
-                WHERE user_id = ? AND cancelled_at IS NULL
-                ORDER BY start_time
-            ''', (user_id,))
-            rows = cursor.fetchall()
+            if upcoming_only:
+                cursor.execute(_SQL_GET_UPCOMING_BOOKINGS, (user_id, _utc_now()))
+            else:
+                cursor.execute(_SQL_GET_ACTIVE_BOOKINGS, (user_id,))
+            while True:
+                rows = cursor.fetchmany(_FETCH_BATCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._booking_from_row(row)
+        finally:
             conn.close()
-            
-            bookings = []
-            for row in rows:
-                # Safely extract fields, handling None values
-                filter_id = row['filter_id'] if row['filter_id'] is not None else None
-                is_auto_booked = bool(row['is_auto_booked']) if row['is_auto_booked'] is not None else False
-                
-                bookings.append(Booking(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    class_id=row['class_id'],
-                    title=row['title'],
-                    start_time=datetime.fromisoformat(row['start_time']),
-                    booked_at=datetime.fromisoformat(row['booked_at']),
-                    cancelled_at=datetime.fromisoformat(row['cancelled_at']) if row['cancelled_at'] else None,
-                    filter_id=filter_id,
-                    is_auto_booked=is_auto_booked,
-                    created_at=datetime.fromisoformat(row['created_at']),
-                    updated_at=datetime.fromisoformat(row['updated_at'])
-                ))
-            return bookings
+    
+    def iter_user_bookings(self, user_id: int, upcoming_only: bool = False) -> Iterator[Booking]:
+        """
+        Iterate active user bookings without materializing the whole list.
+        
+        Rows are fetched _FETCH_BATCH_SIZE at a time, so callers that walk the
+        bookings once keep only one batch in memory. The connection stays open
+        until the iterator is exhausted or closed.
+        """
+        try:
+            yield from self._iter_bookings(user_id, upcoming_only)
+        except Exception as e:
+            logger.error(f"Error iterating user bookings: {e}", extra={'user_id': user_id})
+    
+    def get_user_bookings(self, user_id: int, upcoming_only: bool = False) -> List[Booking]:
+        """
+        Get active user bookings.
+        
+        With upcoming_only bookings that already started are skipped;
+        start times are compared as UTC instants whatever format they were
+        stored in.
+        """
+        try:
+            return list(self._iter_bookings(user_id, upcoming_only))
         except Exception as e:
             logger.error(f"Error getting user bookings: {e}", extra={'user_id': user_id})
             return []
     
-    def is_class_booked(self, user_id: int, class_id: str) -> bool:
-        """Check if class is already booked."""
+    def _load_active_class_ids(self, user_id: int) -> frozenset:
+        """Get active booked class IDs for user, from cache or a single query."""
+        key = (self.db_path, user_id)
+        class_ids = self._active_bookings_cache.get(key)
+        if class_ids is not None:
+            return class_ids
+        
+        with self._active_bookings_lock:
+            version = self._active_bookings_versions.get(key, 0)
+        conn = self.get_connection()
+        try:
+            rows = conn.execute(_SQL_GET_ACTIVE_BOOKING_IDS, (user_id,)).fetchall()
+        finally:
+            conn.close()
+        class_ids = frozenset(row[0] for row in rows)
+        
+        with self._active_bookings_lock:
+            if self._active_bookings_versions.get(key, 0) == version:
+                self._active_bookings_cache[key] = class_ids
+        return class_ids
+    
+    def _uncache_active_bookings(self, user_ids):
+        """Drop cached active class IDs for the given users only."""
+        touched_user_ids = getattr(self._local, 'touched_user_ids', None)
+        if touched_user_ids is not None:
+            # Invalidate again once the transaction ends
+            touched_user_ids.update(user_ids)
+        with self._active_bookings_lock:
+            for user_id in user_ids:
+                key = (self.db_path, user_id)
+                self._active_bookings_cache.pop(key, None)
+                self._active_bookings_versions[key] = self._active_bookings_versions.get(key, 0) + 1
+    
+    def get_active_booking_class_ids(self, user_id: int, upcoming_only: bool = False) -> Set[str]:
+        """Get class IDs of active user bookings without building Booking objects."""
         try:
+            if not upcoming_only:
+                return set(self._load_active_class_ids(user_id))
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM bookings 
-                WHERE user_id = ? AND class_id = ? AND cancelled_at IS NULL
-            ''', (user_id, class_id))
-            result = cursor.fetchone()
+            rows = conn.execute(_SQL_GET_UPCOMING_BOOKING_IDS, (user_id, _utc_now())).fetchall()
             conn.close()
-            return result is not None
+            return {row[0] for row in rows}
+        except Exception as e:
+            logger.error(f"Error getting booked class IDs: {e}", extra={'user_id': user_id})
+            return set()
+    
+    def is_class_booked(self, user_id: int, class_id: str) -> bool:
+        """Check if class is already booked (one query per user, then cached)."""
+        try:
+            return class_id in self._load_active_class_ids(user_id)
         except Exception as e:
             logger.error(f"Error checking booking: {e}", extra={'user_id': user_id})
             return False
@@ -397,6 +687,27 @@ class Database:
     
     # ==================== Filter Management ====================
     
+    @staticmethod
+    def _filter_row(user_filter: 'UserFilter') -> tuple:
+        """Flatten filter into _SQL_INSERT_FILTER parameters."""
+        return (
+            user_filter.user_id,
+            user_filter.club_id,
+            user_filter.club_name,
+            user_filter.zone_id,
+            user_filter.zone_name,
+            user_filter.timetable_id,
+            user_filter.timetable_name,
+            user_filter.category_id,
+            user_filter.category_name,
+            user_filter.trainer_id,
+            user_filter.trainer_name,
+            user_filter.time_from,
+            user_filter.time_to,
+            user_filter.weekdays,
+            1 if user_filter.auto_booking else 0
+        )
+    
     def add_filter(self, user_filter: 'UserFilter') -> bool:
         """Add new user filter (max 3 per user)."""
         try:
@@ -404,43 +715,19 @@ class Database:
             cursor = conn.cursor()
             
             # Check how many filters user already has
-            cursor.execute(
-                'SELECT COUNT(*) as count FROM user_filters WHERE user_id = ?',
-                (user_filter.user_id,)
-            )
+            cursor.execute(_SQL_COUNT_FILTERS, (user_filter.user_id,))
             result = cursor.fetchone()
             filter_count = result['count'] if result else 0
             
             # Reject if already has 3 filters
-            if filter_count >= 3:
+            if filter_count >= MAX_FILTERS_PER_USER:
                 logger.warning(f"User already has 3 filters, cannot add more", 
                               extra={'user_id': user_filter.user_id})
                 conn.close()
                 return False
             
             # Insert new filter (don't delete old ones)
-            cursor.execute('''
-                INSERT INTO user_filters 
-                (user_id, club_id, club_name, zone_id, zone_name, timetable_id, timetable_name, 
-                 category_id, category_name, trainer_id, trainer_name, time_from, time_to, weekdays, auto_booking)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                user_filter.user_id,
-                user_filter.club_id,
-                user_filter.club_name,
-                user_filter.zone_id,
-                user_filter.zone_name,
-                user_filter.timetable_id,
-                user_filter.timetable_name,
-                user_filter.category_id,
-                user_filter.category_name,
-                user_filter.trainer_id,
-                user_filter.trainer_name,
-                user_filter.time_from,
-                user_filter.time_to,
-                user_filter.weekdays,
-                1 if user_filter.auto_booking else 0
-            ))
+            cursor.execute(_SQL_INSERT_FILTER, self._filter_row(user_filter))
             
             conn.commit()
             conn.close()
@@ -451,6 +738,48 @@ class Database:
             logger.error(f"Error saving filter: {e}", extra={'user_id': user_filter.user_id})
             return False
     
+    def add_filters(self, filters: List['UserFilter']) -> List[bool]:
+        """
+        Add several filters with one executemany and a single commit.
+        
+        The per-user limit of 3 filters is applied as in add_filter: filters
+        beyond the limit are skipped.
+        
+        Returns:
+            One flag per filter, True if it was saved
+        """
+        if not filters:
+            return []
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            counts = {}
+            for user_id in {f.user_id for f in filters}:
+                cursor.execute(_SQL_COUNT_FILTERS, (user_id,))
+                result = cursor.fetchone()
+                counts[user_id] = result['count'] if result else 0
+            
+            saved = []
+            rows = []
+            for user_filter in filters:
+                if counts[user_filter.user_id] >= MAX_FILTERS_PER_USER:
+                    saved.append(False)
+                    continue
+                counts[user_filter.user_id] += 1
+                saved.append(True)
+                rows.append(self._filter_row(user_filter))
+            
+            if rows:
+                cursor.executemany(_SQL_INSERT_FILTER, rows)
+                conn.commit()
+            conn.close()
+            logger.info(f"Added {len(rows)} of {len(filters)} filters")
+            return saved
+        except Exception as e:
+            logger.error(f"Error saving filters: {e}")
+            return [False] * len(filters)
+    
     def get_filter(self, user_id: int) -> Optional['UserFilter']:
         """Get first user filter (backwards compatibility). Use get_all_filters() for all filters."""
         try:
@@ -490,6 +819,44 @@ class Database:
             logger.error(f"Error getting filter: {e}", extra={'user_id': user_id})
             return None
     
+    @staticmethod
+    def _filter_from_row(row: sqlite3.Row) -> UserFilter:
+        """Build UserFilter from a user_filters table row."""
+        return UserFilter(
+            id=row['id'],
+            user_id=row['user_id'],
+            club_id=row['club_id'],
+            club_name=row['club_name'],
+            zone_id=row['zone_id'],
+            zone_name=row['zone_name'],
+            timetable_id=row['timetable_id'],
+            timetable_name=row['timetable_name'],
+            category_id=row['category_id'],
+            category_name=row['category_name'],
+            trainer_id=row['trainer_id'],
+            trainer_name=row['trainer_name'],
+            time_from=row['time_from'],
+            time_to=row['time_to'],
+            weekdays=row['weekdays'],
+            auto_booking=bool(row['auto_booking']),
+            created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None,
+            updated_at=datetime.fromisoformat(row['updated_at']) if row['updated_at'] else None
+        )
+    
+    def get_filter_by_id(self, filter_id: int, user_id: int) -> Optional['UserFilter']:
+        """Get single filter by its ID (user_id for security check)."""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(_SQL_GET_FILTER_BY_ID, (filter_id, user_id))
+            row = cursor.fetchone()
+            conn.close()
+            
+            return self._filter_from_row(row) if row else None
+        except Exception as e:
+            logger.error(f"Error getting filter {filter_id}: {e}", extra={'user_id': user_id})
+            return None
+    
     def get_all_filters(self, user_id: int) -> list:
         """Get all filters for user."""
         try:
@@ -502,33 +869,7 @@ class Database:
             rows = cursor.fetchall()
             conn.close()
             
-            if not rows:
-                return []
-            
-            from src.database.models import UserFilter
-            filters = []
-            for row in rows:
-                filters.append(UserFilter(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    club_id=row['club_id'],
-                    club_name=row['club_name'],
-                    zone_id=row['zone_id'],
-                    zone_name=row['zone_name'],
-                    timetable_id=row['timetable_id'],
-                    timetable_name=row['timetable_name'],
-                    category_id=row['category_id'],
-                    category_name=row['category_name'],
-                    trainer_id=row['trainer_id'],
-                    trainer_name=row['trainer_name'],
-                    time_from=row['time_from'],
-                    time_to=row['time_to'],
-                    weekdays=row['weekdays'],
-                    auto_booking=bool(row['auto_booking']),
-                    created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None,
-                    updated_at=datetime.fromisoformat(row['updated_at']) if row['updated_at'] else None
-                ))
-            return filters
+            return [self._filter_from_row(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting all filters: {e}", extra={'user_id': user_id})
             return []
@@ -564,6 +905,30 @@ class Database:
             logger.error(f"Error deleting filter: {e}", extra={'user_id': user_id})
             return False
     
+    def delete_filters_for_users(self, user_ids: Iterable[int]) -> int:
+        """
+        Delete all filters of several users with one statement.
+        
+        Returns:
+            Number of deleted filters
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return 0
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            placeholders = ",".join("?" * len(user_ids))
+            cursor.execute(f'DELETE FROM user_filters WHERE user_id IN ({placeholders})', user_ids)
+            deleted = cursor.rowcount
+            conn.commit()
+            conn.close()
+            logger.info(f"Deleted {deleted} filters for {len(user_ids)} users")
+            return deleted
+        except Exception as e:
+            logger.error(f"Error deleting filters for users {user_ids}: {e}")
+            return 0
+    
     def update_filter_auto_booking(self, filter_id: int, auto_booking: bool, user_id: int) -> bool:
         """Update auto-booking setting for a filter."""
         try:
@@ -588,21 +953,18 @@ class Database:
     def save_filter_catalog(self, zone_id: str, zone_name: str, filter_type: str, data: str, expires_at: datetime = None) -> bool:
         """Save filter catalog (cache for filter options)."""
         try:
-            from datetime import timedelta
             if expires_at is None:
                 expires_at = datetime.now() + timedelta(hours=24)
             
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT OR REPLACE INTO filter_catalog 
-                (zone_id, zone_name, filter_type, data, cached_at, expires_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (zone_id, zone_name, filter_type, data, datetime.now(), expires_at))
+            cursor.execute(_SQL_SAVE_CATALOG,
+                           (zone_id, zone_name, filter_type, data, datetime.now(), expires_at))
             
             conn.commit()
             conn.close()
+            self._cache_catalog(zone_id, filter_type, data, expires_at)
             logger.debug(f"Saved {filter_type} catalog for zone {zone_id}")
             return True
         except Exception as e:
@@ -611,25 +973,25 @@ class Database:
     
     def get_filter_catalog(self, zone_id: str, filter_type: str) -> Optional[str]:
         """Get filter catalog from cache if not expired."""
+        key = (self.db_path, zone_id, filter_type)
         try:
+            cached = self._catalog_cache.get(key)
+            if cached and (cached[1] is None or cached[1] > datetime.now()):
+                return cached[0]
+            
             conn = self.get_connection()
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT data, expires_at FROM filter_catalog 
-                WHERE zone_id = ? AND filter_type = ?
-            ''', (zone_id, filter_type))
+            # Expired rows are skipped by SQLite, not fetched and checked in Python
+            cursor.execute(_SQL_GET_CATALOG, (zone_id, filter_type, datetime.now()))
             row = cursor.fetchone()
             conn.close()
             
             if not row:
+                logger.debug(f"No valid cache for {filter_type} in zone {zone_id}")
                 return None
             
-            # Check if cache is expired
             expires_at = datetime.fromisoformat(row['expires_at']) if row['expires_at'] else None
-            if expires_at and datetime.now() > expires_at:
-                logger.debug(f"Cache expired for {filter_type} in zone {zone_id}")
-                return None
-            
+            self._cache_catalog(zone_id, filter_type, row['data'], expires_at)
             return row['data']
         except Exception as e:
             logger.error(f"Error getting filter catalog: {e}")
@@ -642,20 +1004,82 @@ class Database:
             cursor = conn.cursor()
             
             if zone_id and filter_type:
-                cursor.execute('''
-                    DELETE FROM filter_catalog 
-                    WHERE zone_id = ? AND filter_type = ?
-                ''', (zone_id, filter_type))
+                cursor.execute(_SQL_INVALIDATE_CATALOG_TYPE, (zone_id, filter_type))
             elif zone_id:
-                cursor.execute('DELETE FROM filter_catalog WHERE zone_id = ?', (zone_id,))
+                cursor.execute(_SQL_INVALIDATE_CATALOG_ZONE, (zone_id,))
             else:
-                cursor.execute('DELETE FROM filter_catalog')
+                cursor.execute(_SQL_INVALIDATE_CATALOG_ALL)
             
             conn.commit()
             conn.close()
+            self._uncache_catalog(zone_id, filter_type)
             logger.debug(f"Invalidated filter catalog cache (zone={zone_id}, type={filter_type})")
             return True
         except Exception as e:
             logger.error(f"Error invalidating filter catalog: {e}")
             return False
+    
+    def _cache_catalog(self, zone_id: str, filter_type: str, data: str, expires_at: Optional[datetime]):
+        """Store catalog entry in the in-process cache."""
+        key = (self.db_path, zone_id, filter_type)
+        with self._catalog_lock:
+            cache = self._catalog_cache
+            cache.pop(key, None)
+            if len(cache) >= self._catalog_cache_size:
+                # Evict the oldest entry (dicts keep insertion order)
+                self._drop_cached_catalog(next(iter(cache)))
+            cache[key] = (data, expires_at)
+            self._catalog_zone_index.setdefault(key[:2], set()).add(filter_type)
+    
+    def _drop_cached_catalog(self, key: Tuple[str, str, str]):
+        """Remove single cache entry and its zone index record (lock must be held)."""
+        self._catalog_cache.pop(key, None)
+        filter_types = self._catalog_zone_index.get(key[:2])
+        if filter_types is not None:
+            filter_types.discard(key[2])
+            if not filter_types:
+                del self._catalog_zone_index[key[:2]]
+    
+    def _uncache_catalog(self, zone_id: str = None, filter_type: str = None):
+        """Drop matching entries from the in-process catalog cache."""
+        with self._catalog_lock:
+            if zone_id and filter_type:
+                keys = [(self.db_path, zone_id, filter_type)]
+            elif zone_id:
+                # Only entries of this zone, found via the zone index
+                filter_types = self._catalog_zone_index.get((self.db_path, zone_id), ())
+                keys = [(self.db_path, zone_id, t) for t in filter_types]
+            else:
+                keys = [key for key in self._catalog_cache if key[0] == self.db_path]
+            for key in keys:
+                self._drop_cached_catalog(key)
+    
+    def analyze(self) -> bool:
+        """Refresh planner statistics (sqlite_stat1), e.g. nightly or after bulk inserts."""
+        try:
+            conn = self.get_connection()
+            conn.execute(_SQL_ANALYZE_LIMIT)
+            conn.execute("ANALYZE")
+            conn.close()
+            logger.debug("Database statistics updated")
+            return True
+        except Exception as e:
+            logger.error(f"Error analyzing database: {e}")
+            return False
+    
+    def purge_expired_filter_catalog(self, grace: timedelta = timedelta(days=1)) -> int:
+        """Delete filter catalog entries expired for longer than grace period."""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(_SQL_PURGE_CATALOG, (datetime.now() - grace,))
+            deleted = cursor.rowcount
+            conn.commit()
+            conn.close()
+            if deleted:
+                logger.debug(f"Purged {deleted} expired filter catalog entries")
+            return deleted
+        except Exception as e:
+            logger.error(f"Error purging filter catalog: {e}")
+            return 0
 
@@ -6,7 +6,7 @@ from typing import Optional
 from src.utils.crypto import PasswordEncryptor
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """User model with encrypted password storage."""
     telegram_id: int
@@ -17,10 +17,13 @@ class User:
     _password_encrypted: bool = False  # Track if password is already encrypted
     
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+        # Rows loaded from the database carry both timestamps, skip the clock then
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
     
     def encrypt_password(self) -> None:
         """Encrypt password if not already encrypted."""
@@ -35,7 +38,7 @@ class User:
         return self.zdrofit_password
 
 
-@dataclass
+@dataclass(slots=True)
 class UserFilter:
     """User filter preferences model with gym-dependent activities."""
     id: Optional[int] = None
@@ -58,13 +61,20 @@ class UserFilter:
     updated_at: datetime = None
     
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+        # Rows loaded from the database carry both timestamps, skip the clock then
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
+    
+    def is_empty(self) -> bool:
+        """Check if filter has no class selection criteria."""
+        return not (self.zone_id or self.trainer_id or self.timetable_id or self.category_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class FilterCatalog:
     """Cache for calendar filter options from API."""
     id: Optional[int] = None
@@ -79,17 +89,20 @@ class FilterCatalog:
     
     def __post_init__(self):
         from datetime import timedelta
-        if self.cached_at is None:
-            self.cached_at = datetime.now()
-        if self.expires_at is None:
-            self.expires_at = datetime.now() + timedelta(hours=24)
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+        # Rows loaded from the database carry all timestamps, skip the clock then
+        if None in (self.cached_at, self.expires_at, self.created_at, self.updated_at):
+            now = datetime.now()
+            if self.cached_at is None:
+                self.cached_at = now
+            if self.expires_at is None:
+                self.expires_at = now + timedelta(hours=24)
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
 
 
-@dataclass
+@dataclass(slots=True)
 class Booking:
     """Booking model."""
     id: Optional[int] = None
@@ -105,7 +118,10 @@ class Booking:
     updated_at: datetime = None
     
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+        # Rows loaded from the database carry both timestamps, skip the clock then
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
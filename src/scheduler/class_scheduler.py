@@ -8,6 +8,7 @@ import asyncio
 from src.database.db import Database
 from src.api.zdrofit_client import ZdrofitAPIClient
 from src.telegram_bot.notifications import NotificationSender
+from src.utils.helpers import parse_datetime
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -40,6 +41,13 @@ class ClassCheckScheduler:
                 name='Check available classes',
                 replace_existing=True
             )
+            self.scheduler.add_job(
+                db.analyze,
+                CronTrigger(hour="3", minute="30"),
+                id='analyze_db',
+                name='Refresh database statistics',
+                replace_existing=True
+            )
             self.scheduler.start()
             self.is_running = True
             logger.info("Scheduler started, checking at the beginning of every hour (HH:00)", extra={'user_id': 'system'})
@@ -71,9 +79,13 @@ class ClassCheckScheduler:
                 # Fallback: create a new event loop
                 asyncio.run(self._async_check_classes())
             logger.info("Periodic class check completed successfully", extra={'user_id': 'system'})
+            
+            # Drop filter catalog entries that expired long ago
+            db.purge_expired_filter_catalog()
         except Exception as e:
             logger.error(f"Periodic class check failed: {e}", extra={'user_id': 'system'})
         finally:
+            logger.debug(f"parse_datetime cache: {parse_datetime.cache_info()}", extra={'user_id': 'system'})
             logger.info("=" * 50)
     
     async def _async_check_classes(self):
@@ -145,9 +157,8 @@ class ClassCheckScheduler:
                     seen_ids.add(class_id)
                     classes.append(c)
             
-            # Get already booked classes
-            booked_classes = db.get_user_bookings(user_id)
-            booked_class_ids = {b.class_id for b in booked_classes}
+            # Get already booked classes (all active ones, cached per user)
+            booked_class_ids = db.get_active_booking_class_ids(user_id)
             logger.debug(f"User has {len(booked_class_ids)} booked classes", extra={'user_id': user_id})
             
             if not classes:
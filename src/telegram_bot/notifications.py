@@ -7,6 +7,7 @@ from typing import List, Dict
 from datetime import datetime, timedelta
 import re
 
+from src.utils.helpers import format_datetime_display
 from src.utils.logger import get_logger
 from config.config import (
     TELEGRAM_CONNECT_TIMEOUT,
@@ -159,7 +160,7 @@ class NotificationSender:
             if isinstance(start_time, str):
                 try:
                     dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                    start_time = dt.strftime("%d.%m.%Y %H:%M")
+                    start_time = format_datetime_display(dt)
                 except:
                     pass
             
@@ -191,7 +192,7 @@ class NotificationSender:
             if isinstance(start_time, str):
                 try:
                     dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                    start_time = dt.strftime("%d.%m.%Y %H:%M")
+                    start_time = format_datetime_display(dt)
                 except:
                     pass
             
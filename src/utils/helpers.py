@@ -0,0 +1,70 @@
+"""Helper functions for date/time handling."""
+
+from functools import lru_cache
+from datetime import datetime
+from typing import Optional
+
+
+@lru_cache(maxsize=4096)
+def parse_datetime(value: str) -> Optional[datetime]:
+    """
+    Parse ISO datetime string from the API (e.g. "2026-01-01T14:30:00Z").
+
+    Results are memoized by the raw string: the same start times are parsed
+    for every class on every polling cycle. Use parse_datetime.cache_info()
+    to check the hit ratio when tuning maxsize.
+
+    Returns:
+        Parsed datetime or None if the value is empty or invalid
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+
+
+@lru_cache(maxsize=1024)
+def format_datetime_display(dt: datetime) -> str:
+    """Format datetime for display in messages (DD.MM.YYYY HH:MM)."""
+    return dt.strftime("%d.%m.%Y %H:%M")
+
+
+@lru_cache(maxsize=256)
+def parse_weekday_mask(weekdays: Optional[str]) -> Optional[int]:
+    """
+    Parse weekday selector ("1,2,3,4,5", 1=Monday ... 7=Sunday) into a bitmask.
+    
+    Bit (n - 1) is set for weekday n, so a date matches when
+    mask & (1 << date.weekday()) is non-zero. Numbers outside 1-7 set no bit.
+    
+    Returns:
+        Bitmask, or None if there is no usable selector (empty or invalid),
+        meaning all weekdays are allowed
+    """
+    if not weekdays:
+        return None
+    try:
+        days = [int(day) for day in weekdays.split(',') if day.strip()]
+    except ValueError:
+        return None
+    if not days:
+        return None
+    mask = 0
+    for day in days:
+        if 1 <= day <= 7:
+            mask |= 1 << (day - 1)
+    return mask
+
+
+@lru_cache(maxsize=256)
+def parse_time_of_day(value: Optional[str]) -> Optional[int]:
+    """Parse "HH:MM" into minutes since midnight, or None if empty or invalid."""
+    if not value:
+        return None
+    try:
+        hours, minutes = value.split(':')[:2]
+        return int(hours) * 60 + int(minutes)
+    except ValueError:
+        return None
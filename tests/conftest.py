@@ -0,0 +1,7 @@
+"""Shared pytest configuration for the test suite."""
+
+import os
+import sys
+
+# Make the project root importable once for all test modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
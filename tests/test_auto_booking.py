@@ -1,17 +1,9 @@
-#!/usr/bin/env python
 """Unit tests for auto-booking functionality."""
 
 import unittest
-import sys
-import os
-import tempfile
 from datetime import datetime, timedelta
-from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from src.database.db import Database
 from src.database.models import User, UserFilter, Booking
 
@@ -83,12 +75,8 @@ class TestAutoBookingDatabase(unittest.TestCase):
     """Test auto-booking database operations."""
     
     def setUp(self):
-        """Create a temporary database for testing."""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.db_path = self.temp_db.name
-        self.temp_db.close()
-        
-        self.db = Database(self.db_path)
+        """Create an in-memory database for testing."""
+        self.db = Database(f"file:test_auto_booking_{id(self)}?mode=memory&cache=shared")
         
         # Add a test user
         user = User(
@@ -99,11 +87,8 @@ class TestAutoBookingDatabase(unittest.TestCase):
         self.db.add_user(user)
     
     def tearDown(self):
-        """Clean up temporary database."""
-        try:
-            Path(self.db_path).unlink()
-        except:
-            pass
+        """Release in-memory database."""
+        self.db.close()
     
     def test_save_filter_with_auto_booking(self):
         """Test saving filter with auto_booking=True."""
@@ -496,7 +481,3 @@ class TestAutoBookingNotifications(unittest.TestCase):
         # Verify message does NOT have auto-booking emoji
         self.assertNotIn("🤖", message)
         self.assertIn("Free spot found", message)
-
-
-if __name__ == "__main__":
-    unittest.main()
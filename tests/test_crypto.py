@@ -1,12 +1,6 @@
-#!/usr/bin/env python
 """Unit tests for password encryption/decryption."""
 
 import unittest
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.utils.crypto import PasswordEncryptor
 
@@ -99,7 +93,3 @@ class TestPasswordEncryption(unittest.TestCase):
         encrypted = PasswordEncryptor.encrypt(original_password)
         decrypted = PasswordEncryptor.decrypt(encrypted)
         self.assertEqual(decrypted, original_password)
-
-
-if __name__ == "__main__":
-    unittest.main()
@@ -1,24 +1,14 @@
 """Unit tests for database operations."""
 
-import sys
-import os
 import unittest
-import tempfile
-from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch, MagicMock
 import json
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.database.db import Database
+from src.database.db import Database, _SQL_GET_ACTIVE_BOOKING_IDS
 from src.database.models import User, UserFilter, FilterCatalog, Booking
 from src.api.filter import filter_classes
-from src.utils.helpers import (
-    parse_datetime, format_datetime_display, 
-    is_class_available_soon
-)
+from src.utils.helpers import parse_datetime, format_datetime_display
 
 
 class TestFiltering(unittest.TestCase):
@@ -99,6 +89,17 @@ class TestFiltering(unittest.TestCase):
         filtered = filter_classes(self.classes, None)
         
         self.assertEqual(len(filtered), len(self.classes))
+    
+    def test_filter_with_empty_filter(self):
+        """Test filtering with a filter that has no criteria."""
+        user_filter = UserFilter(user_id=123456)
+        self.assertTrue(user_filter.is_empty())
+        
+        classes = self.classes + [{"Id": "3", "ZoneId": "10", "AvailableSpots": 0}]
+        filtered = filter_classes(classes, user_filter)
+        
+        # Only fully booked class is dropped
+        self.assertEqual([c["Id"] for c in filtered], ["1", "2"])
 
 
 class TestHelpers(unittest.TestCase):
@@ -125,18 +126,12 @@ class TestFilterCatalog(unittest.TestCase):
     """Test filter catalog (cache) operations."""
     
     def setUp(self):
-        """Create a temporary database for testing."""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.db_path = self.temp_db.name
-        self.temp_db.close()
-        self.db = Database(self.db_path)
+        """Create an in-memory database for testing."""
+        self.db = Database(":memory:")
     
     def tearDown(self):
-        """Clean up temporary database."""
-        try:
-            Path(self.db_path).unlink()
-        except:
-            pass
+        """Release in-memory database."""
+        self.db.close()
     
     def test_save_filter_catalog(self):
         """Test saving filter catalog."""
@@ -212,18 +207,30 @@ class TestFilterCatalog(unittest.TestCase):
         self.assertIsNone(self.db.get_filter_catalog(zone_id, "timetables"))
         self.assertIsNone(self.db.get_filter_catalog(zone_id, "trainers"))
         self.assertIsNone(self.db.get_filter_catalog(zone_id, "categories"))
+    
+    def test_invalidate_zone_keeps_other_zones(self):
+        """Test that invalidating one zone keeps other zones cached."""
+        data = json.dumps([{"Id": "1", "Name": "Test"}])
+        self.db.save_filter_catalog("167", "Zdrofit Lazurowa", "timetables", data)
+        self.db.save_filter_catalog("167", "Zdrofit Lazurowa", "trainers", data)
+        self.db.save_filter_catalog("10", "Zdrofit Bemowo", "timetables", data)
+        self.db.save_filter_catalog("10", "Zdrofit Bemowo", "trainers", data)
+        
+        self.db.invalidate_filter_catalog(zone_id="167")
+        
+        self.assertIsNone(self.db.get_filter_catalog("167", "timetables"))
+        self.assertIsNone(self.db.get_filter_catalog("167", "trainers"))
+        self.assertEqual(self.db.get_filter_catalog("10", "timetables"), data)
+        self.assertEqual(self.db.get_filter_catalog("10", "trainers"), data)
+        self.assertIn((self.db.db_path, "10", "trainers"), Database._catalog_cache)
 
 
 class TestBookingCancellation(unittest.TestCase):
     """Test booking cancellation operations."""
     
     def setUp(self):
-        """Create a temporary database and user for testing."""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.db_path = self.temp_db.name
-        self.temp_db.close()
-        
-        self.db = Database(self.db_path)
+        """Create an in-memory database and user for testing."""
+        self.db = Database(":memory:")
         
         # Add a test user
         user = User(
@@ -234,11 +241,8 @@ class TestBookingCancellation(unittest.TestCase):
         self.db.add_user(user)
     
     def tearDown(self):
-        """Clean up temporary database."""
-        try:
-            Path(self.db_path).unlink()
-        except:
-            pass
+        """Release in-memory database."""
+        self.db.close()
     
     def test_cancel_booking(self):
         """Test cancelling a booking."""
@@ -267,14 +271,16 @@ class TestBookingCancellation(unittest.TestCase):
     def test_get_active_bookings_excludes_cancelled(self):
         """Test that cancelled bookings are not in active list."""
         # Add 3 bookings
-        for i in range(3):
-            booking = Booking(
+        bookings = [
+            Booking(
                 user_id=777777,
                 class_id=f"class_cancel_{i}",
                 title=f"Class {i}",
                 start_time=datetime.now() + timedelta(days=1)
             )
-            self.db.add_booking(booking)
+            for i in range(3)
+        ]
+        self.assertEqual(self.db.add_bookings(bookings), 3)
         
         # Verify all 3 are active
         bookings = self.db.get_user_bookings(777777)
@@ -291,6 +297,133 @@ class TestBookingCancellation(unittest.TestCase):
         cancelled_ids = [b.class_id for b in bookings]
         self.assertNotIn("class_cancel_0", cancelled_ids)
     
+    def test_get_user_bookings_upcoming_only(self):
+        """Test that past bookings are skipped unless requested."""
+        self.db.add_bookings([
+            Booking(
+                user_id=777777,
+                class_id="class_past",
+                title="Yoga",
+                start_time=datetime.now() - timedelta(days=1)
+            ),
+            Booking(
+                user_id=777777,
+                class_id="class_upcoming",
+                title="Pilates",
+                start_time=datetime.now() + timedelta(days=1)
+            )
+        ])
+        
+        upcoming = self.db.get_user_bookings(777777, upcoming_only=True)
+        self.assertEqual([b.class_id for b in upcoming], ["class_upcoming"])
+        
+        all_active = self.db.get_user_bookings(777777, upcoming_only=False)
+        self.assertEqual([b.class_id for b in all_active], ["class_past", "class_upcoming"])
+        
+    def test_upcoming_only_with_api_start_times(self):
+        """Test that raw API start times are compared as instants, not text."""
+        now = datetime.now(timezone.utc)
+        api_format = "%Y-%m-%dT%H:%M:%SZ"
+        self.db.add_bookings([
+            Booking(
+                user_id=777777,
+                class_id="class_started_z",
+                title="Yoga",
+                start_time=(now - timedelta(minutes=1)).strftime(api_format)
+            ),
+            Booking(
+                user_id=777777,
+                class_id="class_started",
+                title="Yoga",
+                start_time=(now - timedelta(minutes=1)).strftime("%Y-%m-%dT%H:%M:%S")
+            ),
+            Booking(
+                user_id=777777,
+                class_id="class_later_z",
+                title="Pilates",
+                start_time=(now + timedelta(hours=1)).strftime(api_format)
+            )
+        ])
+        
+        upcoming = self.db.get_user_bookings(777777, upcoming_only=True)
+        self.assertEqual([b.class_id for b in upcoming], ["class_later_z"])
+        self.assertEqual(self.db.get_active_booking_class_ids(777777, upcoming_only=True), {"class_later_z"})
+        self.assertEqual(len(self.db.get_active_booking_class_ids(777777)), 3)
+    
+    def test_iter_user_bookings(self):
+        """Test streaming active bookings in start time order."""
+        self.db.add_bookings([
+            Booking(
+                user_id=777777,
+                class_id=f"class_iter_{i}",
+                title=f"Class {i}",
+                start_time=datetime.now() + timedelta(days=3 - i)
+            )
+            for i in range(3)
+        ])
+        
+        bookings = self.db.iter_user_bookings(777777)
+        self.assertNotIsInstance(bookings, list)
+        self.assertEqual(
+            [b.class_id for b in bookings],
+            ["class_iter_2", "class_iter_1", "class_iter_0"]
+        )
+    
+    def test_get_active_booking_class_ids(self):
+        """Test fetching only class IDs of active bookings."""
+        self.db.add_bookings([
+            Booking(
+                user_id=777777,
+                class_id=f"class_ids_{i}",
+                title=f"Class {i}",
+                start_time=datetime.now() + timedelta(days=1)
+            )
+            for i in range(3)
+        ])
+        self.db.cancel_booking(777777, "class_ids_1")
+        
+        class_ids = self.db.get_active_booking_class_ids(777777)
+        self.assertEqual(class_ids, {"class_ids_0", "class_ids_2"})
+        self.assertEqual(self.db.get_active_booking_class_ids(123), set())
+    
+    def test_booking_write_invalidates_only_that_user(self):
+        """Test that cached booked class IDs are dropped per user on writes."""
+        self.db.add_user(User(
+            telegram_id=777778,
+            zdrofit_email="booking_test2@example.com",
+            zdrofit_password="password123"
+        ))
+        self.db.add_bookings([
+            Booking(user_id=777777, class_id="class_a", title="Yoga",
+                    start_time=datetime.now() + timedelta(days=1)),
+            Booking(user_id=777778, class_id="class_b", title="Pilates",
+                    start_time=datetime.now() + timedelta(days=1))
+        ])
+        
+        self.assertTrue(self.db.is_class_booked(777777, "class_a"))
+        self.assertTrue(self.db.is_class_booked(777778, "class_b"))
+        
+        self.db.cancel_booking(777778, "class_b")
+        
+        self.assertIn((self.db.db_path, 777777), Database._active_bookings_cache)
+        self.assertNotIn((self.db.db_path, 777778), Database._active_bookings_cache)
+        self.assertTrue(self.db.is_class_booked(777777, "class_a"))
+        self.assertFalse(self.db.is_class_booked(777778, "class_b"))
+    
+    def test_active_class_ids_query_uses_index(self):
+        """Test that the query behind is_class_booked is an index search after ANALYZE."""
+        self.assertTrue(self.db.analyze())
+        
+        conn = self.db.get_connection()
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN " + _SQL_GET_ACTIVE_BOOKING_IDS, (777777,)
+        ).fetchall()
+        conn.close()
+        
+        detail = " ".join(row["detail"] for row in plan)
+        self.assertIn("SEARCH bookings USING INDEX idx_bookings_active_user", detail)
+        self.assertIn("user_id=?", detail)
+    
     def test_is_class_booked_after_cancellation(self):
         """Test that cancelled booking is no longer considered booked."""
         booking = Booking(
@@ -312,7 +445,3 @@ class TestBookingCancellation(unittest.TestCase):
         # Cancelled booking should not count as currently booked
         is_booked = self.db.is_class_booked(777777, "class_check_booked")
         self.assertFalse(is_booked)
-
-
-if __name__ == "__main__":
-    unittest.main()
@@ -1,16 +1,19 @@
-#!/usr/bin/env python
-"""Test script for filter functionality."""
+"""
+Test script for filter functionality.
 
+Run from the project root as a module, so the src package is importable:
+    python -m tests.test_filters
+"""
+
+import atexit
 import sys
 import os
 import json
+import traceback
 from datetime import datetime, timedelta
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from src.database.db import Database
-from src.database.models import UserFilter
+from src.database.models import Booking, UserFilter
 from src.api.zdrofit_client import ZdrofitAPIClient
 
 # Test credentials (use your own)
@@ -18,23 +21,73 @@ TEST_EMAIL = "sergeistamal@gmail.com"
 TEST_PASSWORD = "your_password_here"  # Replace with actual password
 TEST_USER_ID = 6181242580
 
+_SEP = "=" * 60
+
+
+def _banner(title: str) -> str:
+    """Build a section header framed by separator lines."""
+    return f"\n{_SEP}\n{title}\n{_SEP}\n"
+
+
+# Logged-in API clients: {(email, password, user_id): client}
+_CLIENTS = {}
+
+
+def _client_for(email: str, password: str, user_id: int) -> ZdrofitAPIClient:
+    """
+    Get API client logged in once per credentials, shared by the API tests.
+    
+    Only successful logins are kept, so a failed one is retried on the next call.
+    """
+    key = (email, password, user_id)
+    client = _CLIENTS.get(key)
+    if client is None:
+        client = ZdrofitAPIClient(email, password)
+        if client.authenticate(user_id):
+            _CLIENTS[key] = client
+    return client
+
+
+# Test users owning the filters created by the database tests
+TEST_FILTER_USER_IDS = (999999, 999998, 999997, 999996)
+
+# Shared Database instance, opened on first use (schema check runs once per run)
+_DB = None
+
+
+def _get_db() -> Database:
+    """Get the shared Database instance used by the database tests."""
+    global _DB
+    if _DB is None:
+        _DB = Database()
+    return _DB
+
+
+def _delete_test_filters(user_ids=TEST_FILTER_USER_IDS):
+    """Remove the filters of the given test users with one statement."""
+    if _DB is not None:
+        _DB.delete_filters_for_users(user_ids)
+
+
+def teardown_module(module):
+    """Safety net after the database tests when run under pytest (each test cleans up after itself)."""
+    _delete_test_filters()
+
 
 def test_api_get_calendar_filters():
     """Test getting calendar filters from API."""
-    print("\n" + "=" * 60)
-    print("TEST 1: API - Get Calendar Filters")
-    print("=" * 60)
+    sys.stdout.write(_banner("TEST 1: API - Get Calendar Filters"))
     
     try:
-        client = ZdrofitAPIClient(TEST_EMAIL, TEST_PASSWORD)
-        if not client.authenticate(TEST_USER_ID):
+        client = _client_for(TEST_EMAIL, TEST_PASSWORD, TEST_USER_ID)
+        if not client.authenticated:
             print("[FAIL] Failed to authenticate")
             return False
         
         print("[PASS] Authenticated successfully")
         
         # Get filters for club 75 (Lazurowa)
-        filters = client.get_calendar_filters(user_id=TEST_USER_ID, club_id=75)
+        filters = client.get_calendar_filters(zone_id=75, user_id=TEST_USER_ID)
         
         if not filters:
             print("[FAIL] No filters returned from API")
@@ -60,19 +113,17 @@ def test_api_get_calendar_filters():
         return True
     except Exception as e:
         print(f"[FAIL] Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        if os.environ.get("ZDROFIT_TEST_DEBUG"):
+            traceback.print_exc()
         return False
 
 
 def test_db_filter_operations():
     """Test database filter operations."""
-    print("\n" + "=" * 60)
-    print("TEST 2: Database - Filter Operations")
-    print("=" * 60)
+    sys.stdout.write(_banner("TEST 2: Database - Filter Operations"))
     
     try:
-        db = Database()
+        db = _get_db()
         
         # Create a test filter with current model structure
         test_filter = UserFilter(
@@ -129,20 +180,21 @@ def test_db_filter_operations():
         return True
     except Exception as e:
         print(f"[FAIL] Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        if os.environ.get("ZDROFIT_TEST_DEBUG"):
+            traceback.print_exc()
         return False
+    finally:
+        # Clean up even when a check fails
+        _delete_test_filters((999999,))
 
 
 def test_get_available_classes():
     """Test getting available classes with filters."""
-    print("\n" + "=" * 60)
-    print("TEST 3: API - Get Available Classes")
-    print("=" * 60)
+    sys.stdout.write(_banner("TEST 3: API - Get Available Classes"))
     
     try:
-        client = ZdrofitAPIClient(TEST_EMAIL, TEST_PASSWORD)
-        if not client.authenticate(TEST_USER_ID):
+        client = _client_for(TEST_EMAIL, TEST_PASSWORD, TEST_USER_ID)
+        if not client.authenticated:
             print("[FAIL] Failed to authenticate")
             return False
         
@@ -159,12 +211,15 @@ def test_get_available_classes():
         if isinstance(classes, list):
             print(f"[PASS] Retrieved {len(classes)} available classes")
             
-            for cls in classes[:3]:  # Show first 3
-                print(f"\n   {cls.get('title')}")
-                print(f"      Gym: {cls.get('gym_name')}")
-                print(f"      Trainer: {cls.get('trainer_name')}")
-                print(f"      Time: {cls.get('start_time')}")
-                print(f"      Available spots: {cls.get('available_spots')}")
+            # Show first 3 with a single write
+            sys.stdout.write("".join(
+                f"\n   {cls.get('title')}\n"
+                f"      Gym: {cls.get('gym_name')}\n"
+                f"      Trainer: {cls.get('trainer_name')}\n"
+                f"      Time: {cls.get('start_time')}\n"
+                f"      Available spots: {cls.get('available_spots')}\n"
+                for cls in classes[:3]
+            ))
             
             return True
         else:
@@ -173,19 +228,17 @@ def test_get_available_classes():
             
     except Exception as e:
         print(f"[FAIL] Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        if os.environ.get("ZDROFIT_TEST_DEBUG"):
+            traceback.print_exc()
         return False
 
 
 def test_auto_booking_filter_creation():
     """Test creating filter with auto-booking enabled."""
-    print("\n" + "=" * 60)
-    print("TEST 4: Database - Auto-Booking Filter Creation")
-    print("=" * 60)
+    sys.stdout.write(_banner("TEST 4: Database - Auto-Booking Filter Creation"))
     
     try:
-        db = Database()
+        db = _get_db()
         
         # Create a filter with auto-booking enabled
         test_filter = UserFilter(
@@ -221,28 +274,23 @@ def test_auto_booking_filter_creation():
             print("[FAIL] Auto-booking flag not set correctly")
             return False
         
-        # Clean up
-        db.delete_filter_by_id(retrieved_filters[0].id, 999998)
-        
         return True
     except Exception as e:
         print(f"[FAIL] Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        if os.environ.get("ZDROFIT_TEST_DEBUG"):
+            traceback.print_exc()
         return False
+    finally:
+        # Clean up even when a check fails
+        _delete_test_filters((999998,))
 
 
 def test_auto_booking_limit():
     """Test that auto-booking limit is enforced (max 3 bookings per filter)."""
-    print("\n" + "=" * 60)
-    print("TEST 5: Database - Auto-Booking Limit Enforcement")
-    print("=" * 60)
+    sys.stdout.write(_banner("TEST 5: Database - Auto-Booking Limit Enforcement"))
     
     try:
-        from src.database.models import Booking
-        from datetime import datetime, timedelta
-        
-        db = Database()
+        db = _get_db()
         
         # Create a filter with auto-booking
         test_filter = UserFilter(
@@ -257,13 +305,14 @@ def test_auto_booking_limit():
         db.add_filter(test_filter)
         filter_id = db.get_all_filters(999997)[0].id
         
-        # Add 3 bookings (at limit)
+        # Add 3 bookings (at limit), on consecutive days from one base time
+        now = datetime.now()
         for i in range(3):
             booking = Booking(
                 user_id=999997,
                 class_id=f"class_limit_{i}",
                 title="Pilates Class",
-                start_time=datetime.now() + timedelta(days=i),
+                start_time=now + timedelta(days=i),
                 filter_id=filter_id,
                 is_auto_booked=True
             )
@@ -285,25 +334,23 @@ def test_auto_booking_limit():
             print("[FAIL] Auto-booking should be disabled at limit")
             return False
         
-        # Clean up
-        db.delete_filter_by_id(filter_id, 999997)
-        
         return True
     except Exception as e:
         print(f"[FAIL] Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        if os.environ.get("ZDROFIT_TEST_DEBUG"):
+            traceback.print_exc()
         return False
+    finally:
+        # Clean up even when a check fails
+        _delete_test_filters((999997,))
 
 
 def test_auto_booking_update():
     """Test updating auto-booking flag for existing filter."""
-    print("\n" + "=" * 60)
-    print("TEST 6: Database - Update Auto-Booking Flag")
-    print("=" * 60)
+    sys.stdout.write(_banner("TEST 6: Database - Update Auto-Booking Flag"))
     
     try:
-        db = Database()
+        db = _get_db()
         
         # Create filter with auto-booking disabled
         test_filter = UserFilter(
@@ -356,20 +403,22 @@ def test_auto_booking_update():
             print("[FAIL] Auto-booking should be disabled")
             return False
         
-        # Clean up
-        db.delete_filter_by_id(filter_id, 999996)
-        
         return True
     except Exception as e:
         print(f"[FAIL] Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        if os.environ.get("ZDROFIT_TEST_DEBUG"):
+            traceback.print_exc()
         return False
+    finally:
+        # Clean up even when a check fails
+        _delete_test_filters((999996,))
 
 
 if __name__ == "__main__":
+    atexit.register(_delete_test_filters)
+    
     print("\nFilter Functionality Test Suite")
-    print("=" * 60)
+    print(_SEP)
     
     results = []
     
@@ -392,9 +441,7 @@ if __name__ == "__main__":
     results.append(("DB - Update Auto-Booking Flag", test_auto_booking_update()))
     
     # Summary
-    print("\n" + "=" * 60)
-    print("Test Results Summary")
-    print("=" * 60)
+    sys.stdout.write(_banner("Test Results Summary"))
     
     for test_name, result in results:
         status = "[PASS]" if result else "[FAIL]"
@@ -1,17 +1,10 @@
-#!/usr/bin/env python
 """Unit tests for filter functionality with multiple filters support."""
 
+import itertools
 import unittest
-import sys
-import os
-import tempfile
 import json
-from pathlib import Path
 from datetime import datetime, timedelta
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from src.database.db import Database
 from src.database.models import User, UserFilter, Booking
 
@@ -19,35 +12,34 @@ from src.database.models import User, UserFilter, Booking
 class TestMultipleFilters(unittest.TestCase):
     """Test multiple filter creation and management."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one in-memory database shared by all tests."""
+        cls.db = Database(":memory:")
+        # Each test gets its own user, so tests stay isolated in the shared database
+        cls._uid_counter = itertools.count(900000)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Release in-memory database."""
+        cls.db.close()
+    
     def setUp(self):
-        """Create a temporary database for testing."""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.db_path = self.temp_db.name
-        self.temp_db.close()
-        
-        self.db = Database(self.db_path)
-        
-        # Add a test user
+        """Add a fresh test user."""
+        self.user_id = next(self._uid_counter)
         user = User(
-            telegram_id=888888,
-            zdrofit_email="filter_test@example.com",
+            telegram_id=self.user_id,
+            zdrofit_email=f"filter_test_{self.user_id}@example.com",
             zdrofit_password="password123"
         )
         self.db.add_user(user)
     
-    def tearDown(self):
-        """Clean up temporary database."""
-        try:
-            Path(self.db_path).unlink()
-        except:
-            pass
-    
     def test_create_multiple_filters(self):
         """Test creating multiple filters for same user."""
-        # Create 3 filters
-        for i in range(3):
-            user_filter = UserFilter(
-                user_id=888888,
+        # Create 3 filters in one batch
+        results = self.db.add_filters([
+            UserFilter(
+                user_id=self.user_id,
                 club_id=75,
                 club_name="Zdrofit Lazurowa",
                 zone_id="167",
@@ -57,30 +49,32 @@ class TestMultipleFilters(unittest.TestCase):
                 category_id="9",
                 category_name="Mini Class"
             )
-            result = self.db.add_filter(user_filter)
-            self.assertTrue(result)
+            for i in range(3)
+        ])
+        self.assertEqual(results, [True, True, True])
         
         # Retrieve all filters
-        filters = self.db.get_all_filters(888888)
+        filters = self.db.get_all_filters(self.user_id)
         self.assertEqual(len(filters), 3)
     
     def test_filter_limit_max_3(self):
         """Test that user cannot create more than 3 filters."""
-        # Create 3 filters
-        for i in range(3):
-            user_filter = UserFilter(
-                user_id=888888,
+        # Create 3 filters in one batch, the 4th one in the batch is rejected
+        results = self.db.add_filters([
+            UserFilter(
+                user_id=self.user_id,
                 club_id=75,
                 club_name="Zdrofit Lazurowa",
                 timetable_id=f"class_{i}",
                 timetable_name=f"Class {i}"
             )
-            result = self.db.add_filter(user_filter)
-            self.assertTrue(result)
+            for i in range(4)
+        ])
+        self.assertEqual(results, [True, True, True, False])
         
-        # Try to create 4th filter
+        # Adding one more separately is rejected as well
         user_filter_4 = UserFilter(
-            user_id=888888,
+            user_id=self.user_id,
             club_id=75,
             club_name="Zdrofit Lazurowa",
             timetable_id="class_4",
@@ -90,14 +84,30 @@ class TestMultipleFilters(unittest.TestCase):
         self.assertFalse(result)
         
         # Still should have only 3
-        filters = self.db.get_all_filters(888888)
+        filters = self.db.get_all_filters(self.user_id)
         self.assertEqual(len(filters), 3)
     
+    def test_transaction_rolls_back_on_error(self):
+        """Test that filters added in a failed transaction are not kept."""
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.db.add_filter(UserFilter(
+                    user_id=self.user_id,
+                    club_id=75,
+                    club_name="Zdrofit Lazurowa",
+                    timetable_id="63",
+                    timetable_name="Pilates"
+                ))
+                self.assertEqual(len(self.db.get_all_filters(self.user_id)), 1)
+                raise RuntimeError("abort")
+        
+        self.assertEqual(len(self.db.get_all_filters(self.user_id)), 0)
+    
     def test_get_specific_filter_by_id(self):
         """Test retrieving a specific filter by ID."""
         # Create a filter
         user_filter = UserFilter(
-            user_id=888888,
+            user_id=self.user_id,
             club_id=75,
             club_name="Zdrofit Lazurowa",
             timetable_id="63",
@@ -106,7 +116,7 @@ class TestMultipleFilters(unittest.TestCase):
         self.db.add_filter(user_filter)
         
         # Get all and find ID
-        filters = self.db.get_all_filters(888888)
+        filters = self.db.get_all_filters(self.user_id)
         filter_id = filters[0].id
         
         self.assertIsNotNone(filter_id)
@@ -116,7 +126,7 @@ class TestMultipleFilters(unittest.TestCase):
         # Create 2 filters
         for i in range(2):
             user_filter = UserFilter(
-                user_id=888888,
+                user_id=self.user_id,
                 club_id=75,
                 club_name="Zdrofit Lazurowa",
                 timetable_id=f"63{i}",
@@ -124,23 +134,41 @@ class TestMultipleFilters(unittest.TestCase):
             )
             self.db.add_filter(user_filter)
         
-        filters = self.db.get_all_filters(888888)
+        filters = self.db.get_all_filters(self.user_id)
         first_filter_id = filters[0].id
         
         # Delete first filter
-        result = self.db.delete_filter_by_id(first_filter_id, 888888)
+        result = self.db.delete_filter_by_id(first_filter_id, self.user_id)
         self.assertTrue(result)
         
         # Should have 1 left
-        remaining = self.db.get_all_filters(888888)
+        remaining = self.db.get_all_filters(self.user_id)
         self.assertEqual(len(remaining), 1)
         self.assertNotEqual(remaining[0].id, first_filter_id)
     
+    def test_delete_filters_for_users(self):
+        """Test deleting filters of several users at once."""
+        other_user_id = next(self._uid_counter)
+        kept_user_id = next(self._uid_counter)
+        self.db.add_filters([
+            UserFilter(user_id=user_id, club_id=75, timetable_id="63", timetable_name="Pilates")
+            for user_id in (self.user_id, self.user_id, other_user_id, kept_user_id)
+        ])
+        
+        deleted = self.db.delete_filters_for_users([self.user_id, other_user_id])
+        self.assertEqual(deleted, 3)
+        self.assertEqual(self.db.get_all_filters(self.user_id), [])
+        self.assertEqual(self.db.get_all_filters(other_user_id), [])
+        self.assertEqual(len(self.db.get_all_filters(kept_user_id)), 1)
+        
+        # Nothing to delete
+        self.assertEqual(self.db.delete_filters_for_users([]), 0)
+    
     def test_filter_with_optional_fields(self):
         """Test creating filters with minimal and full field sets."""
         # Minimal filter
         minimal_filter = UserFilter(
-            user_id=888888,
+            user_id=self.user_id,
             club_id=75,
             club_name="Zdrofit Lazurowa",
             timetable_id="63",
@@ -150,7 +178,7 @@ class TestMultipleFilters(unittest.TestCase):
         
         # Full filter
         full_filter = UserFilter(
-            user_id=888888,
+            user_id=self.user_id,
             club_id=75,
             club_name="Zdrofit Lazurowa",
             zone_id="167",
@@ -167,15 +195,24 @@ class TestMultipleFilters(unittest.TestCase):
         )
         self.db.add_filter(full_filter)
         
-        filters = self.db.get_all_filters(888888)
+        filters = self.db.get_all_filters(self.user_id)
         self.assertEqual(len(filters), 2)
         self.assertIsNone(filters[0].trainer_id)
         self.assertIsNotNone(filters[1].trainer_id)
+        
+        # Point lookup returns the same filter
+        full = self.db.get_filter_by_id(filters[1].id, self.user_id)
+        self.assertEqual(full.trainer_name, "Adam")
+        self.assertEqual(full.weekdays, "1,2,3,4,5")
+        self.assertIsNone(self.db.get_filter_by_id(-1, self.user_id))
+        
+        # Another user's filter is not returned
+        self.assertIsNone(self.db.get_filter_by_id(filters[1].id, self.user_id + 1))
     
     def test_filter_with_auto_booking_enabled(self):
         """Test filter with auto-booking enabled."""
         user_filter = UserFilter(
-            user_id=888888,
+            user_id=self.user_id,
             club_id=75,
             club_name="Zdrofit Lazurowa",
             timetable_id="63",
@@ -184,14 +221,14 @@ class TestMultipleFilters(unittest.TestCase):
         )
         self.db.add_filter(user_filter)
         
-        filters = self.db.get_all_filters(888888)
+        filters = self.db.get_all_filters(self.user_id)
         self.assertTrue(filters[0].auto_booking)
     
     def test_auto_booking_flag_toggle(self):
         """Test toggling auto-booking flag for a filter."""
         # Create filter with auto_booking disabled
         user_filter = UserFilter(
-            user_id=888888,
+            user_id=self.user_id,
             club_id=75,
             club_name="Zdrofit Lazurowa",
             timetable_id="63",
@@ -199,23 +236,21 @@ class TestMultipleFilters(unittest.TestCase):
             auto_booking=False
         )
         self.db.add_filter(user_filter)
-        filter_id = self.db.get_all_filters(888888)[0].id
+        filter_id = self.db.get_all_filters(self.user_id)[0].id
         
         # Enable auto-booking
-        self.db.update_filter_auto_booking(filter_id, True, 888888)
-        filters = self.db.get_all_filters(888888)
-        self.assertTrue(filters[0].auto_booking)
+        self.db.update_filter_auto_booking(filter_id, True, self.user_id)
+        self.assertTrue(self.db.get_filter_by_id(filter_id, self.user_id).auto_booking)
         
         # Disable auto-booking
-        self.db.update_filter_auto_booking(filter_id, False, 888888)
-        filters = self.db.get_all_filters(888888)
-        self.assertFalse(filters[0].auto_booking)
+        self.db.update_filter_auto_booking(filter_id, False, self.user_id)
+        self.assertFalse(self.db.get_filter_by_id(filter_id, self.user_id).auto_booking)
     
     def test_filter_with_weekdays(self):
         """Test filter with specific weekdays."""
         # Monday to Friday
         user_filter = UserFilter(
-            user_id=888888,
+            user_id=self.user_id,
             club_id=75,
             club_name="Zdrofit Lazurowa",
             timetable_id="63",
@@ -224,13 +259,13 @@ class TestMultipleFilters(unittest.TestCase):
         )
         self.db.add_filter(user_filter)
         
-        filters = self.db.get_all_filters(888888)
+        filters = self.db.get_all_filters(self.user_id)
         self.assertEqual(filters[0].weekdays, "1,2,3,4,5")
     
     def test_filter_with_time_range(self):
         """Test filter with time range."""
         user_filter = UserFilter(
-            user_id=888888,
+            user_id=self.user_id,
             club_id=75,
             club_name="Zdrofit Lazurowa",
             timetable_id="63",
@@ -240,10 +275,6 @@ class TestMultipleFilters(unittest.TestCase):
         )
         self.db.add_filter(user_filter)
         
-        filters = self.db.get_all_filters(888888)
+        filters = self.db.get_all_filters(self.user_id)
         self.assertEqual(filters[0].time_from, "07:00")
         self.assertEqual(filters[0].time_to, "20:00")
-
-
-if __name__ == "__main__":
-    unittest.main()
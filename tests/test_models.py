@@ -1,27 +1,32 @@
-#!/usr/bin/env python
 """Unit tests for database models."""
 
+import copy
 import unittest
-import sys
-import os
 from datetime import datetime, timedelta
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from unittest.mock import patch
 
 from src.database.models import User, UserFilter, Booking
 
+# Fixed timestamps, only their relative order matters in these tests
+_NOW = datetime(2025, 1, 1, 12, 0, 0)
+_TOMORROW = _NOW + timedelta(days=1)
+
 
 class TestUserModel(unittest.TestCase):
     """Test User model."""
     
-    def test_user_creation(self):
-        """Test creating a user."""
-        user = User(
+    @classmethod
+    def setUpClass(cls):
+        """Create one user shared by the tests (copy it before mutating)."""
+        cls.user = User(
             telegram_id=123456,
             zdrofit_email="test@example.com",
             zdrofit_password="password123"
         )
+    
+    def test_user_creation(self):
+        """Test creating a user."""
+        user = self.user
         
         self.assertEqual(user.telegram_id, 123456)
         self.assertEqual(user.zdrofit_email, "test@example.com")
@@ -30,11 +35,7 @@ class TestUserModel(unittest.TestCase):
     
     def test_user_password_encryption(self):
         """Test user password encryption."""
-        user = User(
-            telegram_id=123456,
-            zdrofit_email="test@example.com",
-            zdrofit_password="password123"
-        )
+        user = copy.copy(self.user)
         
         original_password = user.zdrofit_password
         user.encrypt_password()
@@ -51,6 +52,17 @@ class TestUserModel(unittest.TestCase):
 class TestUserFilter(unittest.TestCase):
     """Test UserFilter model."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one filter with only the required fields, shared by read-only tests."""
+        cls.minimal_filter = UserFilter(
+            user_id=123456,
+            club_id=75,
+            club_name="Zdrofit Lazurowa",
+            timetable_id="63",
+            timetable_name="Full Body Workout"
+        )
+    
     def test_filter_creation(self):
         """Test creating a filter with all fields."""
         user_filter = UserFilter(
@@ -70,23 +82,16 @@ class TestUserFilter(unittest.TestCase):
             weekdays="1,2,3,4,5"
         )
         
-        self.assertEqual(user_filter.user_id, 123456)
-        self.assertEqual(user_filter.club_id, 75)
-        self.assertEqual(user_filter.time_from, "07:00")
-        self.assertEqual(user_filter.time_to, "20:00")
-        self.assertEqual(user_filter.weekdays, "1,2,3,4,5")
-        self.assertIsNotNone(user_filter.created_at)
+        self.assertTupleEqual(
+            (user_filter.user_id, user_filter.club_id, user_filter.time_from,
+             user_filter.time_to, user_filter.weekdays, user_filter.created_at is not None),
+            (123456, 75, "07:00", "20:00", "1,2,3,4,5", True)
+        )
     
     def test_filter_optional_fields(self):
         """Test filter with optional fields."""
-        user_filter = UserFilter(
-            user_id=123456,
-            club_id=75,
-            club_name="Zdrofit Lazurowa",
-            timetable_id="63",
-            timetable_name="Full Body Workout"
-            # trainer_id and other optional fields are None
-        )
+        # trainer_id and other optional fields are None
+        user_filter = self.minimal_filter
         
         self.assertIsNone(user_filter.trainer_id)
         self.assertIsNone(user_filter.time_from)
@@ -107,40 +112,35 @@ class TestUserFilter(unittest.TestCase):
     
     def test_filter_auto_booking_default_disabled(self):
         """Test that auto_booking defaults to False."""
-        user_filter = UserFilter(
-            user_id=123456,
-            club_id=75,
-            club_name="Zdrofit Lazurowa",
-            timetable_id="63",
-            timetable_name="Yoga"
-        )
-        
-        self.assertFalse(user_filter.auto_booking)
+        self.assertFalse(self.minimal_filter.auto_booking)
 
 
 class TestBooking(unittest.TestCase):
     """Test Booking model."""
     
-    def test_booking_creation(self):
-        """Test creating a basic booking."""
-        start_time = datetime.now() + timedelta(days=1)
-        
-        booking = Booking(
+    @classmethod
+    def setUpClass(cls):
+        """Create one basic booking shared by read-only tests."""
+        cls.booking = Booking(
             user_id=123456,
             class_id="1091041",
             title="Trening Cross",
-            start_time=start_time
+            start_time=_TOMORROW
         )
+    
+    def test_booking_creation(self):
+        """Test creating a basic booking."""
+        booking = self.booking
         
-        self.assertEqual(booking.user_id, 123456)
-        self.assertEqual(booking.class_id, "1091041")
-        self.assertEqual(booking.title, "Trening Cross")
-        self.assertEqual(booking.start_time, start_time)
-        self.assertIsNotNone(booking.created_at)
+        self.assertTupleEqual(
+            (booking.user_id, booking.class_id, booking.title,
+             booking.start_time, booking.created_at is not None),
+            (123456, "1091041", "Trening Cross", _TOMORROW, True)
+        )
     
     def test_booking_with_auto_booking_fields(self):
         """Test booking with auto-booking fields."""
-        start_time = datetime.now() + timedelta(days=1)
+        start_time = _TOMORROW
         
         booking = Booking(
             user_id=123456,
@@ -156,15 +156,8 @@ class TestBooking(unittest.TestCase):
     
     def test_booking_auto_booked_default_false(self):
         """Test that is_auto_booked defaults to False."""
-        booking = Booking(
-            user_id=123456,
-            class_id="1091041",
-            title="Trening Cross",
-            start_time=datetime.now()
-        )
-        
-        self.assertFalse(booking.is_auto_booked)
-        self.assertIsNone(booking.filter_id)
+        self.assertFalse(self.booking.is_auto_booked)
+        self.assertIsNone(self.booking.filter_id)
     
     def test_booking_manual_booking(self):
         """Test manual booking (without auto-booking fields)."""
@@ -172,17 +165,32 @@ class TestBooking(unittest.TestCase):
             user_id=123456,
             class_id="1091041",
             title="Yoga",
-            start_time=datetime.now(),
+            start_time=_NOW,
             is_auto_booked=False
         )
         
         self.assertFalse(booking.is_auto_booked)
         self.assertIsNone(booking.filter_id)
     
+    def test_booking_from_row_skips_clock(self):
+        """Test that a booking with both timestamps does not read the clock."""
+        with patch("src.database.models.datetime") as mock_datetime:
+            booking = Booking(
+                user_id=123456,
+                class_id="1091041",
+                title="Yoga",
+                start_time=_TOMORROW,
+                created_at=_NOW,
+                updated_at=_NOW
+            )
+        
+        mock_datetime.now.assert_not_called()
+        self.assertEqual((booking.created_at, booking.updated_at), (_NOW, _NOW))
+    
     def test_booking_cancellation(self):
         """Test booking with cancellation info."""
-        start_time = datetime.now() + timedelta(days=1)
-        cancel_time = datetime.now()
+        start_time = _TOMORROW
+        cancel_time = _NOW
         
         booking = Booking(
             user_id=123456,
@@ -197,7 +205,3 @@ class TestBooking(unittest.TestCase):
         self.assertIsNotNone(booking.cancelled_at)
         self.assertEqual(booking.cancelled_at, cancel_time)
         self.assertTrue(booking.is_auto_booked)
-
-
-if __name__ == "__main__":
-    unittest.main()
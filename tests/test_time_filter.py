@@ -1,8 +1,15 @@
-#!/usr/bin/env python
 """Test suite for time filter functionality."""
 
 import unittest
 
+from src.api.zdrofit_client import ZdrofitAPIClient
+
+# Hour -> "HH:00" display label
+_HH00 = "{:02d}:00".format
+
+# Expected result of parsing "6,7,8,9" / "06,07,08,09"
+_HOURS_6789 = [6, 7, 8, 9]
+
 
 class TestTimeSelectionToggle(unittest.TestCase):
     """Test time selection toggle logic."""
@@ -12,12 +19,12 @@ class TestTimeSelectionToggle(unittest.TestCase):
         filter_times = None
         
         # Select 06
-        times_list = [t for t in filter_times.split(',') if t] if filter_times else []
-        hour_str = "06"
-        if hour_str not in times_list:
-            times_list.append(hour_str)
-        times_list.sort(key=lambda x: int(x))
-        filter_times = ','.join(times_list) if times_list else None
+        times_list = [int(t) for t in filter_times.split(',') if t] if filter_times else []
+        hour = 6
+        if hour not in times_list:
+            times_list.append(hour)
+        times_list.sort()
+        filter_times = ','.join(f"{h:02d}" for h in times_list) if times_list else None
         
         self.assertEqual(filter_times, "06")
     
@@ -26,24 +33,24 @@ class TestTimeSelectionToggle(unittest.TestCase):
         filter_times = None
         
         # Select 06
-        times_list = [t for t in filter_times.split(',') if t] if filter_times else []
-        times_list.append("06")
-        times_list.sort(key=lambda x: int(x))
-        filter_times = ','.join(times_list)
+        times_list = [int(t) for t in filter_times.split(',') if t] if filter_times else []
+        times_list.append(6)
+        times_list.sort()
+        filter_times = ','.join(f"{h:02d}" for h in times_list)
         self.assertEqual(filter_times, "06")
         
         # Select 08
-        times_list = filter_times.split(',')
-        times_list.append("08")
-        times_list.sort(key=lambda x: int(x))
-        filter_times = ','.join(times_list)
+        times_list = [int(t) for t in filter_times.split(',')]
+        times_list.append(8)
+        times_list.sort()
+        filter_times = ','.join(f"{h:02d}" for h in times_list)
         self.assertEqual(filter_times, "06,08")
         
         # Select 09
-        times_list = filter_times.split(',')
-        times_list.append("09")
-        times_list.sort(key=lambda x: int(x))
-        filter_times = ','.join(times_list)
+        times_list = [int(t) for t in filter_times.split(',')]
+        times_list.append(9)
+        times_list.sort()
+        filter_times = ','.join(f"{h:02d}" for h in times_list)
         self.assertEqual(filter_times, "06,08,09")
     
     def test_deselect_hour(self):
@@ -51,44 +58,44 @@ class TestTimeSelectionToggle(unittest.TestCase):
         filter_times = "06,08,09"
         
         # Deselect 08
-        times_list = [t for t in filter_times.split(',') if t]
-        times_list.remove("08")
-        times_list.sort(key=lambda x: int(x))
-        filter_times = ','.join(times_list) if times_list else None
+        times_list = [int(t) for t in filter_times.split(',') if t]
+        times_list.remove(8)
+        times_list.sort()
+        filter_times = ','.join(f"{h:02d}" for h in times_list) if times_list else None
         
         self.assertEqual(filter_times, "06,09")
     
     def test_toggle_hour_on_and_off(self):
         """Test toggling a single hour on and off."""
         filter_times = None
-        hour_str = "14"
+        hour = 14
         
         # Toggle on
-        times_list = [t for t in filter_times.split(',') if t] if filter_times else []
-        if hour_str in times_list:
-            times_list.remove(hour_str)
+        times_list = [int(t) for t in filter_times.split(',') if t] if filter_times else []
+        if hour in times_list:
+            times_list.remove(hour)
         else:
-            times_list.append(hour_str)
-        times_list.sort(key=lambda x: int(x))
-        filter_times = ','.join(times_list) if times_list else None
+            times_list.append(hour)
+        times_list.sort()
+        filter_times = ','.join(f"{h:02d}" for h in times_list) if times_list else None
         self.assertEqual(filter_times, "14")
         
         # Toggle off
-        times_list = [t for t in filter_times.split(',') if t]
-        if hour_str in times_list:
-            times_list.remove(hour_str)
+        times_list = [int(t) for t in filter_times.split(',') if t]
+        if hour in times_list:
+            times_list.remove(hour)
         else:
-            times_list.append(hour_str)
-        times_list.sort(key=lambda x: int(x))
-        filter_times = ','.join(times_list) if times_list else None
+            times_list.append(hour)
+        times_list.sort()
+        filter_times = ','.join(f"{h:02d}" for h in times_list) if times_list else None
         self.assertIsNone(filter_times)
     
     def test_sort_hours_correctly(self):
         """Test that selected hours are always sorted."""
         # Select in non-sequential order: 22, 06, 14
-        times_list = ["22", "06", "14"]
-        times_list.sort(key=lambda x: int(x))
-        filter_times = ','.join(times_list)
+        times_list = [22, 6, 14]
+        times_list.sort()
+        filter_times = ','.join(f"{h:02d}" for h in times_list)
         
         self.assertEqual(filter_times, "06,14,22")
 
@@ -145,37 +152,22 @@ class TestTimeRangeConversion(unittest.TestCase):
 class TestTimeDisplayFormat(unittest.TestCase):
     """Test time display formatting for UI."""
     
-    def test_format_single_hour_for_display(self):
-        """Test formatting single hour for display."""
-        time_hours = "14"
-        hours = [int(h) for h in time_hours.split(',')]
-        time_display = ', '.join(f"{h:02d}:00" for h in hours)
-        
-        self.assertEqual(time_display, "14:00")
+    # (time_hours, expected display)
+    CASES = [
+        ("14", "14:00"),                                                # single hour
+        ("6,7,8,9", "06:00, 07:00, 08:00, 09:00"),                     # consecutive hours
+        ("6,18", "06:00, 18:00"),                                       # non-consecutive hours
+        ("6,8,10,18,20,22", "06:00, 08:00, 10:00, 18:00, 20:00, 22:00"),  # scattered hours
+    ]
     
-    def test_format_consecutive_hours_for_display(self):
-        """Test formatting consecutive hours for display."""
-        time_hours = "6,7,8,9"
-        hours = [int(h) for h in time_hours.split(',')]
-        time_display = ', '.join(f"{h:02d}:00" for h in hours)
-        
-        self.assertEqual(time_display, "06:00, 07:00, 08:00, 09:00")
-    
-    def test_format_non_consecutive_hours_for_display(self):
-        """Test formatting non-consecutive hours for display."""
-        time_hours = "6,18"
-        hours = [int(h) for h in time_hours.split(',')]
-        time_display = ', '.join(f"{h:02d}:00" for h in hours)
-        
-        self.assertEqual(time_display, "06:00, 18:00")
-    
-    def test_format_multiple_scattered_hours(self):
-        """Test formatting multiple scattered hours for display."""
-        time_hours = "6,8,10,18,20,22"
-        hours = [int(h) for h in time_hours.split(',')]
-        time_display = ', '.join(f"{h:02d}:00" for h in hours)
-        
-        self.assertEqual(time_display, "06:00, 08:00, 10:00, 18:00, 20:00, 22:00")
+    def test_format_hours_for_display(self):
+        """Test formatting selected hours for display."""
+        for time_hours, expected in self.CASES:
+            with self.subTest(time_hours=time_hours):
+                hours = [int(h) for h in time_hours.split(',')]
+                time_display = ', '.join(map(_HH00, hours))
+                
+                self.assertEqual(time_display, expected)
 
 
 class TestTimeConfirmationDisplay(unittest.TestCase):
@@ -190,7 +182,7 @@ class TestTimeConfirmationDisplay(unittest.TestCase):
         message = ""
         if time_hours:
             hours = [int(h) for h in time_hours.split(',')]
-            time_display = ', '.join(f"{h:02d}:00" for h in hours)
+            time_display = ', '.join(map(_HH00, hours))
             message = f"Time: {time_display}"
         elif time_from or time_to:
             message = f"Time: {time_from or '00:00'} - {time_to or '23:59'}"
@@ -206,7 +198,7 @@ class TestTimeConfirmationDisplay(unittest.TestCase):
         message = ""
         if time_hours:
             hours = [int(h) for h in time_hours.split(',')]
-            time_display = ', '.join(f"{h:02d}:00" for h in hours)
+            time_display = ', '.join(map(_HH00, hours))
             message = f"Time: {time_display}"
         elif time_from or time_to:
             message = f"Time: {time_from or '00:00'} - {time_to or '23:59'}"
@@ -222,7 +214,7 @@ class TestTimeConfirmationDisplay(unittest.TestCase):
         message = ""
         if time_hours:
             hours = [int(h) for h in time_hours.split(',')]
-            time_display = ', '.join(f"{h:02d}:00" for h in hours)
+            time_display = ', '.join(map(_HH00, hours))
             message = f"Time: {time_display}"
         elif time_from or time_to:
             message = f"Time: {time_from or '00:00'} - {time_to or '23:59'}"
@@ -237,7 +229,7 @@ class TestEdgeCases(unittest.TestCase):
         """Test earliest available hour (06:00)."""
         time_hours = "6"
         hours = [int(h) for h in time_hours.split(',')]
-        time_display = ', '.join(f"{h:02d}:00" for h in hours)
+        time_display = ', '.join(map(_HH00, hours))
         
         self.assertEqual(time_display, "06:00")
         self.assertGreaterEqual(hours[0], 6)
@@ -246,7 +238,7 @@ class TestEdgeCases(unittest.TestCase):
         """Test latest available hour (22:00)."""
         time_hours = "22"
         hours = [int(h) for h in time_hours.split(',')]
-        time_display = ', '.join(f"{h:02d}:00" for h in hours)
+        time_display = ', '.join(map(_HH00, hours))
         
         self.assertEqual(time_display, "22:00")
         self.assertLessEqual(hours[0], 22)
@@ -273,34 +265,56 @@ class TestTimeHourParsing(unittest.TestCase):
     
     def test_parse_valid_hours_string(self):
         """Test parsing valid hours string."""
-        filter_times = "6,7,8,9"
-        hours = [int(h) for h in filter_times.split(',')]
+        hours = [int(h) for h in "6,7,8,9".split(',')]
         
-        self.assertEqual(hours, [6, 7, 8, 9])
+        self.assertEqual(hours, _HOURS_6789)
         self.assertTrue(all(6 <= h <= 22 for h in hours))
     
     def test_parse_hours_with_leading_zeros(self):
         """Test parsing hours with leading zeros."""
-        filter_times = "06,07,08,09"
-        hours = [int(h) for h in filter_times.split(',')]
+        hours = [int(h) for h in "06,07,08,09".split(',')]
         
-        self.assertEqual(hours, [6, 7, 8, 9])
+        self.assertEqual(hours, _HOURS_6789)
     
     def test_parse_single_digit_hours(self):
         """Test parsing single digit hours."""
-        filter_times = "6"
-        hours = [int(h) for h in filter_times.split(',')]
+        hours = [int(h) for h in "6".split(',')]
         
         self.assertEqual(hours, [6])
     
     def test_split_filter_times_correctly(self):
         """Test that split operation works correctly."""
-        filter_times = "6,14,22"
-        times_list = [t for t in filter_times.split(',') if t]
+        times_list = "6,14,22".split(',')
         
-        self.assertEqual(len(times_list), 3)
         self.assertEqual(times_list, ["6", "14", "22"])
 
 
-if __name__ == '__main__':
-    unittest.main()
+
+class TestTimeRangeFilter(unittest.TestCase):
+    """Test time range filtering of classes in ZdrofitAPIClient."""
+    
+    classes = (
+        {"id": "1", "start_time": "2026-01-19T06:00:00Z"},
+        {"id": "2", "start_time": "2026-01-19T14:30:00Z"},
+        {"id": "3", "start_time": "2026-01-19T20:59:00Z"},
+        {"id": "4", "start_time": None},
+    )
+    
+    filter_by_slot = staticmethod(ZdrofitAPIClient._filter_by_slot)
+    
+    def _ids(self, time_from, time_to):
+        """Ids of the sample classes kept by a time-only filter."""
+        return [c["id"] for c in self.filter_by_slot(self.classes, None, time_from, time_to)]
+    
+    def test_bounds_are_inclusive(self):
+        """Test that classes starting exactly on a bound are kept."""
+        self.assertEqual(self._ids("06:00", "20:59"), ["1", "2", "3", "4"])
+        self.assertEqual(self._ids("14:00", "14:59"), ["2", "4"])
+        self.assertEqual(self._ids("14:31", None), ["3", "4"])
+    
+    def test_malformed_bound_matches_no_start_time(self):
+        """Test that a bound which is not HH:MM excludes classes instead of being ignored."""
+        for time_from, time_to in (("abc", None), (None, "25"), ("06:00", "late")):
+            with self.subTest(time_from=time_from, time_to=time_to):
+                # Only the class without a start time is left, as with any time filter
+                self.assertEqual(self._ids(time_from, time_to), ["4"])
@@ -1,13 +1,10 @@
-#!/usr/bin/env python
 """Unit tests for input validation."""
 
 import unittest
-import sys
-import os
 import re
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Compiled once for all validations
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
 
 class EmailValidator:
@@ -16,8 +13,7 @@ class EmailValidator:
     @staticmethod
     def validate(email: str) -> bool:
         """Validate email format."""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email)) and len(email) <= 254
+        return len(email) <= 254 and _EMAIL_RE.match(email) is not None
 
 
 class PasswordValidator:
@@ -29,108 +25,55 @@ class PasswordValidator:
         return 1 <= len(password) <= 200
 
 
+# (email, expected) pairs checked by TestEmailValidation
+EMAIL_CASES = [
+    ("user@example.com", True),                          # simple
+    ("user+tag@example.com", True),                      # plus addressing
+    ("user@mail.example.co.uk", True),                   # subdomain
+    ("user123@example456.com", True),                    # numbers
+    ("user.name@example.com", True),                     # dot in local part
+    ("a" * (254 - len("@example.com")) + "@example.com", True),  # maximum length (254)
+    ("userexample.com", False),                          # missing @
+    ("user@", False),                                    # missing domain
+    ("@example.com", False),                             # missing local part
+    ("user@domain.c", False),                            # too short TLD
+    ("a" * 250 + "@example.com", False),                 # exceeds length limit
+    ("user name@example.com", False),                    # spaces
+    ("user#name@example.com", False),                    # invalid special characters
+]
+
+# (password, expected) pairs checked by TestPasswordValidation
+PASSWORD_CASES = [
+    ("password123", True),                               # simple
+    ("P@ssw0rd!", True),                                 # special characters
+    ("a", True),                                         # single character (minimum)
+    ("x" * 200, True),                                   # maximum length (200)
+    ("пароль123", True),                                 # unicode characters
+    ("pass word 123", True),                             # spaces
+    ("MyP@ssw0rd!#2026", True),                          # mixed character types
+    ("", False),                                         # empty
+    ("x" * 201, False),                                  # exceeds maximum length
+]
+
+
 class TestEmailValidation(unittest.TestCase):
     """Test email validation."""
     
-    def test_valid_email_simple(self):
-        """Test simple valid email."""
-        self.assertTrue(EmailValidator.validate("user@example.com"))
-    
-    def test_valid_email_with_plus(self):
-        """Test valid email with plus addressing."""
-        self.assertTrue(EmailValidator.validate("user+tag@example.com"))
-    
-    def test_valid_email_with_subdomain(self):
-        """Test valid email with subdomain."""
-        self.assertTrue(EmailValidator.validate("user@mail.example.co.uk"))
-    
-    def test_valid_email_with_numbers(self):
-        """Test valid email with numbers."""
-        self.assertTrue(EmailValidator.validate("user123@example456.com"))
-    
-    def test_valid_email_with_dot(self):
-        """Test valid email with dot in local part."""
-        self.assertTrue(EmailValidator.validate("user.name@example.com"))
-    
-    def test_invalid_email_missing_at(self):
-        """Test invalid email without @ sign."""
-        self.assertFalse(EmailValidator.validate("userexample.com"))
-    
-    def test_invalid_email_missing_domain(self):
-        """Test invalid email missing domain."""
-        self.assertFalse(EmailValidator.validate("user@"))
-    
-    def test_invalid_email_missing_local(self):
-        """Test invalid email missing local part."""
-        self.assertFalse(EmailValidator.validate("@example.com"))
-    
-    def test_invalid_email_short_tld(self):
-        """Test invalid email with too short TLD."""
-        self.assertFalse(EmailValidator.validate("user@domain.c"))
-    
-    def test_invalid_email_too_long(self):
-        """Test invalid email exceeding length limit."""
-        long_email = "a" * 250 + "@example.com"
-        self.assertFalse(EmailValidator.validate(long_email))
-    
-    def test_valid_email_max_length(self):
-        """Test valid email at maximum allowed length."""
-        # Create email exactly 254 characters
-        local_part = "a" * (254 - len("@example.com"))
-        email = local_part + "@example.com"
-        self.assertEqual(len(email), 254)
-        self.assertTrue(EmailValidator.validate(email))
-    
-    def test_invalid_email_with_spaces(self):
-        """Test invalid email with spaces."""
-        self.assertFalse(EmailValidator.validate("user name@example.com"))
-    
-    def test_invalid_email_with_special_chars(self):
-        """Test invalid email with invalid special characters."""
-        self.assertFalse(EmailValidator.validate("user#name@example.com"))
+    def test_email_cases(self):
+        """Test valid and invalid emails from EMAIL_CASES."""
+        for email, expected in EMAIL_CASES:
+            with self.subTest(email=email):
+                self.assertIs(EmailValidator.validate(email), expected)
 
 
 class TestPasswordValidation(unittest.TestCase):
     """Test password validation."""
     
-    def test_valid_password_simple(self):
-        """Test simple valid password."""
-        self.assertTrue(PasswordValidator.validate("password123"))
-    
-    def test_valid_password_with_special_chars(self):
-        """Test password with special characters."""
-        self.assertTrue(PasswordValidator.validate("P@ssw0rd!"))
-    
-    def test_valid_password_single_char(self):
-        """Test password with single character (minimum)."""
-        self.assertTrue(PasswordValidator.validate("a"))
-    
-    def test_valid_password_max_length(self):
-        """Test password at maximum length (200 chars)."""
-        password = "x" * 200
-        self.assertEqual(len(password), 200)
-        self.assertTrue(PasswordValidator.validate(password))
-    
-    def test_valid_password_with_unicode(self):
-        """Test password with unicode characters."""
-        self.assertTrue(PasswordValidator.validate("пароль123"))
-    
-    def test_invalid_password_empty(self):
-        """Test empty password."""
-        self.assertFalse(PasswordValidator.validate(""))
-    
-    def test_invalid_password_too_long(self):
-        """Test password exceeding maximum length."""
-        password = "x" * 201
-        self.assertFalse(PasswordValidator.validate(password))
-    
-    def test_valid_password_with_spaces(self):
-        """Test password with spaces."""
-        self.assertTrue(PasswordValidator.validate("pass word 123"))
-    
-    def test_valid_password_complex(self):
-        """Test complex password with mixed character types."""
-        self.assertTrue(PasswordValidator.validate("MyP@ssw0rd!#2026"))
+    def test_password_cases(self):
+        """Test valid and invalid passwords from PASSWORD_CASES."""
+        for password, expected in PASSWORD_CASES:
+            with self.subTest(password=password):
+                self.assertIs(PasswordValidator.validate(password), expected)
 
 
 class TestValidationCombined(unittest.TestCase):
@@ -167,7 +110,3 @@ class TestValidationCombined(unittest.TestCase):
         
         self.assertFalse(EmailValidator.validate(email))
         self.assertFalse(PasswordValidator.validate(password))
-
-
-if __name__ == "__main__":
-    unittest.main()
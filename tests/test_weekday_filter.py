@@ -1,164 +1,169 @@
-#!/usr/bin/env python
 """Unit tests for weekday filtering functionality."""
 
 import unittest
-import sys
-import os
-from datetime import datetime, timedelta
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from collections import defaultdict
+from datetime import datetime
+from types import MappingProxyType
 
 from src.api.zdrofit_client import ZdrofitAPIClient
+from src.utils.helpers import parse_datetime, parse_weekday_mask
+
+
+# Sample classes, one per day of the week (UTC start times, as the API returns them)
+_MON_ISO = "2026-01-19T06:00:00Z"  # Monday, January 19, 2026 at 06:00
+_TUE_ISO = "2026-01-20T06:15:00Z"  # Tuesday, January 20, 2026 at 06:15
+_WED_ISO = "2026-01-21T06:00:00Z"  # Wednesday, January 21, 2026 at 06:00
+_THU_ISO = "2026-01-22T06:15:00Z"  # Thursday, January 22, 2026 at 06:15
+_FRI_ISO = "2026-01-23T06:00:00Z"  # Friday, January 23, 2026 at 06:00
+_SAT_ISO = "2026-01-24T10:00:00Z"  # Saturday, January 24, 2026 at 10:00
+_SUN_ISO = "2026-01-25T10:00:00Z"  # Sunday, January 25, 2026 at 10:00
+
+# Read-only, shared by all tests; extend with "+" instead of mutating
+SAMPLE_CLASSES = tuple(MappingProxyType(cls) for cls in [
+    {
+        "id": "1",
+        "title": "Monday Class",
+        "start_time": _MON_ISO,
+        "trainer_name": "ANDRZEJ KOWALSKI"
+    },
+    {
+        "id": "2",
+        "title": "Tuesday Class",
+        "start_time": _TUE_ISO,
+        "trainer_name": "ANDRZEJ KOWALSKI"
+    },
+    {
+        "id": "3",
+        "title": "Wednesday Class",
+        "start_time": _WED_ISO,
+        "trainer_name": "ANDRZEJ KOWALSKI"
+    },
+    {
+        "id": "4",
+        "title": "Thursday Class",
+        "start_time": _THU_ISO,
+        "trainer_name": "ANDRZEJ KOWALSKI"
+    },
+    {
+        "id": "5",
+        "title": "Friday Class",
+        "start_time": _FRI_ISO,
+        "trainer_name": "ANDRZEJ KOWALSKI"
+    },
+    {
+        "id": "6",
+        "title": "Saturday Class",
+        "start_time": _SAT_ISO,
+        "trainer_name": "ADAM TEST"
+    },
+    {
+        "id": "7",
+        "title": "Sunday Class",
+        "start_time": _SUN_ISO,
+        "trainer_name": "ADAM TEST"
+    }
+])
+
+ALL_WEEKDAYS = frozenset(range(1, 8))
+
+
+def _classes_by_weekday(classes) -> dict:
+    """Map ISO weekday (1=Monday ... 7=Sunday) to ids of the classes starting that day."""
+    by_weekday = defaultdict(list)
+    for cls in classes:
+        by_weekday[datetime.fromisoformat(cls["start_time"]).isoweekday()].append(cls["id"])
+    return by_weekday
+
+
+CLASSES_BY_WEEKDAY = _classes_by_weekday(SAMPLE_CLASSES)
+
+
+def _ids_on(weekdays) -> list:
+    """Ids of the sample classes on the given ISO weekdays, in schedule order."""
+    return [class_id for weekday in sorted(weekdays) for class_id in CLASSES_BY_WEEKDAY[weekday]]
 
 
 class TestWeekdayFiltering(unittest.TestCase):
     """Test weekday filtering logic in ZdrofitAPIClient."""
     
-    def setUp(self):
-        """Set up test client and sample classes."""
-        self.client = ZdrofitAPIClient("test@example.com", "password")
-        
-        # Create sample classes for different days
-        # Monday class
-        monday = datetime(2026, 1, 19, 6, 0)  # Monday, January 19, 2026 at 06:00
-        # Tuesday class
-        tuesday = datetime(2026, 1, 20, 6, 15)  # Tuesday, January 20, 2026 at 06:15
-        # Wednesday class
-        wednesday = datetime(2026, 1, 21, 6, 0)  # Wednesday, January 21, 2026 at 06:00
-        # Thursday class
-        thursday = datetime(2026, 1, 22, 6, 15)  # Thursday, January 22, 2026 at 06:15
-        # Friday class
-        friday = datetime(2026, 1, 23, 6, 0)  # Friday, January 23, 2026 at 06:00
-        # Saturday class
-        saturday = datetime(2026, 1, 24, 10, 0)  # Saturday, January 24, 2026 at 10:00
-        # Sunday class
-        sunday = datetime(2026, 1, 25, 10, 0)  # Sunday, January 25, 2026 at 10:00
-        
-        self.classes = [
-            {
-                "id": "1",
-                "title": "Monday Class",
-                "start_time": monday.isoformat() + "Z",
-                "trainer_name": "ANDRZEJ KOWALSKI"
-            },
-            {
-                "id": "2",
-                "title": "Tuesday Class",
-                "start_time": tuesday.isoformat() + "Z",
-                "trainer_name": "ANDRZEJ KOWALSKI"
-            },
-            {
-                "id": "3",
-                "title": "Wednesday Class",
-                "start_time": wednesday.isoformat() + "Z",
-                "trainer_name": "ANDRZEJ KOWALSKI"
-            },
-            {
-                "id": "4",
-                "title": "Thursday Class",
-                "start_time": thursday.isoformat() + "Z",
-                "trainer_name": "ANDRZEJ KOWALSKI"
-            },
-            {
-                "id": "5",
-                "title": "Friday Class",
-                "start_time": friday.isoformat() + "Z",
-                "trainer_name": "ANDRZEJ KOWALSKI"
-            },
-            {
-                "id": "6",
-                "title": "Saturday Class",
-                "start_time": saturday.isoformat() + "Z",
-                "trainer_name": "ADAM TEST"
-            },
-            {
-                "id": "7",
-                "title": "Sunday Class",
-                "start_time": sunday.isoformat() + "Z",
-                "trainer_name": "ADAM TEST"
-            }
-        ]
+    classes = SAMPLE_CLASSES
     
-    def test_filter_single_weekday_tuesday(self):
-        """Test filtering for only Tuesday (weekday 2)."""
-        weekdays = "2"  # Tuesday only
-        filtered = self.client._filter_by_weekdays(self.classes, weekdays)
-        
-        self.assertEqual(len(filtered), 1)
-        self.assertEqual(filtered[0]["id"], "2")
-        self.assertEqual(filtered[0]["title"], "Tuesday Class")
+    # The filter is a static method, so no client (and HTTP session) is needed
+    filter_by_slot = staticmethod(ZdrofitAPIClient._filter_by_slot)
     
-    def test_filter_weekdays_monday_to_friday(self):
-        """Test filtering for Monday-Friday (weekdays 1-5)."""
-        weekdays = "1,2,3,4,5"  # Monday to Friday
-        filtered = self.client._filter_by_weekdays(self.classes, weekdays)
-        
-        self.assertEqual(len(filtered), 5)
-        ids = [c["id"] for c in filtered]
-        self.assertIn("1", ids)  # Monday
-        self.assertIn("2", ids)  # Tuesday
-        self.assertIn("3", ids)  # Wednesday
-        self.assertIn("4", ids)  # Thursday
-        self.assertIn("5", ids)  # Friday
-        self.assertNotIn("6", ids)  # Saturday should be excluded
-        self.assertNotIn("7", ids)  # Sunday should be excluded
-    
-    def test_filter_weekend_only(self):
-        """Test filtering for weekend only (Saturday, Sunday)."""
-        weekdays = "6,7"  # Saturday, Sunday
-        filtered = self.client._filter_by_weekdays(self.classes, weekdays)
-        
-        self.assertEqual(len(filtered), 2)
-        ids = [c["id"] for c in filtered]
-        self.assertIn("6", ids)  # Saturday
-        self.assertIn("7", ids)  # Sunday
-    
-    def test_filter_specific_days_tuesday_thursday(self):
-        """Test filtering for Tuesday and Thursday only."""
-        weekdays = "2,4"  # Tuesday, Thursday
-        filtered = self.client._filter_by_weekdays(self.classes, weekdays)
-        
-        self.assertEqual(len(filtered), 2)
-        ids = [c["id"] for c in filtered]
-        self.assertIn("2", ids)  # Tuesday
-        self.assertIn("4", ids)  # Thursday
-        self.assertNotIn("1", ids)  # Monday excluded
-        self.assertNotIn("3", ids)  # Wednesday excluded
-        self.assertNotIn("5", ids)  # Friday excluded
-    
-    def test_filter_no_weekdays_returns_all(self):
-        """Test that empty weekdays filter returns all classes."""
-        weekdays = ""
-        filtered = self.client._filter_by_weekdays(self.classes, weekdays)
-        
-        self.assertEqual(len(filtered), 7)
-    
-    def test_filter_none_weekdays_returns_all(self):
-        """Test that None weekdays filter returns all classes."""
-        weekdays = None
-        filtered = self.client._filter_by_weekdays(self.classes, weekdays)
-        
-        self.assertEqual(len(filtered), 7)
+    def test_filter_by_weekday_selector(self):
+        """Test filtering for different weekday selectors."""
+        # (selector, allowed ISO weekdays)
+        cases = [
+            ("2", {2}),                                         # Tuesday only
+            ("1,2,3,4,5", {1, 2, 3, 4, 5}),                     # Monday to Friday
+            ("6,7", {6, 7}),                                    # weekend only
+            ("2,4", {2, 4}),                                    # Tuesday and Thursday
+            ("1,7", {1, 7}),                                    # Monday and Sunday
+            ("", ALL_WEEKDAYS),                                 # empty selector returns all
+            (None, ALL_WEEKDAYS),                               # no selector returns all
+        ]
+        for weekdays, allowed in cases:
+            with self.subTest(weekdays=weekdays):
+                filtered = self.filter_by_slot(self.classes, weekdays)
+                self.assertEqual([c["id"] for c in filtered], _ids_on(allowed))
     
     def test_filter_invalid_class_no_start_time(self):
-        """Test that classes without start_time are excluded."""
-        classes_with_invalid = self.classes + [
+        """Test that classes without a valid start_time are excluded."""
+        classes_with_invalid = self.classes + (
             {
                 "id": "8",
                 "title": "No Time Class",
                 "start_time": None,
                 "trainer_name": "TEST"
-            }
-        ]
+            },
+            {
+                "id": "9",
+                "title": "Empty Time Class",
+                "start_time": "",
+                "trainer_name": "TEST"
+            },
+            {
+                "id": "10",
+                "title": "Bad Time Class",
+                "start_time": "not a date",
+                "trainer_name": "TEST"
+            },
+        )
         
         weekdays = "1,2,3,4,5"
-        filtered = self.client._filter_by_weekdays(classes_with_invalid, weekdays)
+        filtered = self.filter_by_slot(classes_with_invalid, weekdays)
         
-        # Should only get Monday-Friday classes, invalid one excluded
+        # Should only get Monday-Friday classes, invalid ones excluded
         self.assertEqual(len(filtered), 5)
         ids = [c["id"] for c in filtered]
         self.assertNotIn("8", ids)
+        self.assertNotIn("9", ids)
+        self.assertNotIn("10", ids)
+    
+    def test_weekday_mask_semantics(self):
+        """Test weekday selector to bitmask mapping used by the filter."""
+        self.assertEqual(parse_weekday_mask("1,7"), 0b1000001)
+        self.assertEqual(parse_weekday_mask("1,2,3,4,5"), 0b0011111)
+        self.assertEqual(parse_weekday_mask("6,7"), 0b1100000)
+        self.assertIsNone(parse_weekday_mask(""))
+        self.assertIsNone(parse_weekday_mask(None))
+        self.assertIsNone(parse_weekday_mask("mon"))
+        
+        # Weekdays outside 1-7 match nothing
+        self.assertEqual(self.filter_by_slot(self.classes, "8"), [])
+    
+    def test_repeated_filter_parses_start_times_once(self):
+        """Test that filtering the same classes again reuses parsed start times."""
+        parse_datetime.cache_clear()
+        
+        first = self.filter_by_slot(self.classes, "1,2,3,4,5")
+        second = self.filter_by_slot(self.classes, "6,7")
+        
+        # 7 distinct start times: parsed on the first pass, cache hits on the second
+        info = parse_datetime.cache_info()
+        self.assertEqual((info.misses, info.hits), (7, 7))
+        self.assertEqual(len(first) + len(second), 7)
     
     def test_real_world_bug_scenario(self):
         """
@@ -169,7 +174,7 @@ class TestWeekdayFiltering(unittest.TestCase):
         weekdays = "2"  # Tuesday
         
         # Apply weekday filter
-        filtered = self.client._filter_by_weekdays(self.classes, weekdays)
+        filtered = self.filter_by_slot(self.classes, weekdays)
         
         # Should ONLY have Tuesday class
         self.assertEqual(len(filtered), 1)
@@ -179,7 +184,18 @@ class TestWeekdayFiltering(unittest.TestCase):
         # Thursday class should NOT be in results
         thursday_ids = [c["id"] for c in filtered if c["id"] == "4"]
         self.assertEqual(len(thursday_ids), 0, "Thursday class should be excluded when filtering for Tuesday only")
-
-
-if __name__ == "__main__":
-    unittest.main()
+    
+    def test_filter_by_slot_weekdays_and_time(self):
+        """Test combined weekday and time filtering."""
+        # Weekdays 06:10-07:00 -> Tuesday and Thursday 06:15 classes
+        filtered = self.filter_by_slot(self.classes, "1,2,3,4,5", "06:10", "07:00")
+        self.assertEqual([c["id"] for c in filtered], ["2", "4"])
+        
+        # Time range only, class without start time is kept
+        classes = self.classes + ({"id": "8", "title": "No Date Class"},)
+        filtered = self.filter_by_slot(classes, None, "09:00", None)
+        self.assertEqual([c["id"] for c in filtered], ["6", "7", "8"])
+        
+        # Weekday filter drops class without start time
+        filtered = self.filter_by_slot(classes, "6,7", "09:00", None)
+        self.assertEqual([c["id"] for c in filtered], ["6", "7"])